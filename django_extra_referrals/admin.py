@@ -13,11 +13,13 @@ from .models import (
     GradeRule,
     GradeRate,
     Referral,
-    Transaction
+    Transaction,
+    TransactionArchive,
+    Leaderboard,
+    ReferralLinkStat
 )
 
 
-# TODO Next Release
 @admin.register(Rate)
 class RateAdmin(admin.ModelAdmin):
     list_display = [
@@ -27,7 +29,6 @@ class RateAdmin(admin.ModelAdmin):
     ]
 
 
-# TODO Next Release
 @admin.register(Rule)
 class RuleAdmin(admin.ModelAdmin):
     list_display = [
@@ -48,7 +49,6 @@ class GradeRuleInline(admin.TabularInline):
     model = GradeRule
 
 
-# TODO Next Release
 @admin.register(Grade)
 class GradeAdmin(admin.ModelAdmin):
     inlines = [GradeRuleInline, GradeRateInline]
@@ -61,19 +61,28 @@ class GradeAdmin(admin.ModelAdmin):
 
 @admin.register(Referral)
 class ReferralAdmin(MPTTModelAdmin):
-    list_filter = ['level']
+    list_filter = ['level', 'grade']
     list_select_related = ['account', 'parent']
     search_fields = ['account__first_name', 'account__last_name']
-    list_display = ['inner_id', 'account', 'parent', 'decendants', 'downlines', 'level', 'created_at', 'balance']
+    list_display = [
+        'inner_id', 'account', 'parent', 'decendants', 'downlines', 'downline_levels',
+        'level', 'created_at', 'balance'
+    ]
 
     def decendants(self, obj):
         return obj.get_descendant_count()
 
     def downlines(self, obj):
-        return obj.downlines.count()
+        counters = {counter.depth: counter.count for counter in obj.downline_counters.all()}
+        return counters.get(1, 0)
+
+    def downline_levels(self, obj):
+        return ', '.join('%s: %s' % (counter.depth, counter.count) for counter in obj.downline_counters.all())
 
     def get_queryset(self, request):
-        return super().get_queryset(request).only('inner_id', 'account', 'parent')
+        return super().get_queryset(request).only(
+            'inner_id', 'account', 'parent'
+        ).prefetch_related('downline_counters')
 
 
 @admin.register(Transaction)
@@ -84,6 +93,43 @@ class TransactionAdmin(admin.ModelAdmin):
     list_display = ['inner_id', 'referral', 'note', 'flow', 'rate', 'total', 'balance', 'created_at']
 
 
+@admin.register(TransactionArchive)
+class TransactionArchiveAdmin(admin.ModelAdmin):
+    # date_hierarchy filters by created_at range, PostgreSQL scans only matching partitions
+    date_hierarchy = 'created_at'
+    list_filter = ['flow']
+    list_select_related = ['referral__account']
+    search_fields = ['inner_id', 'referral__account__username']
+    list_display = ['inner_id', 'referral', 'note', 'flow', 'rate', 'total', 'balance', 'created_at']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(Leaderboard)
+class LeaderboardAdmin(admin.ModelAdmin):
+    list_filter = ['period']
+    list_select_related = ['referral__account']
+    search_fields = ['referral__account__first_name', 'referral__account__username']
+    list_display = ['period', 'referral', 'score', 'modified_at']
+    ordering = ['-period', '-score']
+
+
+@admin.register(ReferralLinkStat)
+class ReferralLinkStatAdmin(admin.ModelAdmin):
+    date_hierarchy = 'date'
+    list_select_related = ['referral__account']
+    search_fields = ['referral__inner_id', 'referral__account__username']
+    list_display = ['date', 'referral', 'clicks', 'conversions', 'conversion_rate']
+    ordering = ['-date', '-clicks']
+
+
 class ReferralInline(admin.TabularInline):
     model = Referral
     can_delete = False
@@ -3,4 +3,9 @@ from django.apps import AppConfig as AppConfigBase
 class AppConfig(AppConfigBase):
     name = 'django_extra_referrals'
     label = 'django_extra_referrals'
-    verbose_name = 'Referrals'
\ No newline at end of file
+    verbose_name = 'Referrals'
+
+    def ready(self):
+        from . import checks  # noqa: register system checks
+        from . import config  # noqa: connect configuration signals
+        from . import signals  # noqa: connect downline counter signals
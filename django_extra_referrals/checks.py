@@ -0,0 +1,21 @@
+from django.conf import settings
+from django.core.checks import Warning, register
+
+PROCESS_LOCAL_CACHES = [
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+]
+
+
+@register()
+def check_shared_cache(app_configs, **kwargs):
+    """ Config versions are bumped in the cache, every worker must see the bump """
+    backend = settings.CACHES.get('default', {}).get('BACKEND')
+    if settings.DEBUG or backend not in PROCESS_LOCAL_CACHES:
+        return []
+    return [Warning(
+        "The default cache %s is local to each process." % backend,
+        hint="Configure a shared cache (database, memcached or redis), otherwise "
+             "workers keep stale referral configuration after changes.",
+        id='django_extra_referrals.W001',
+    )]
@@ -0,0 +1,100 @@
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Referral, Grade, GradeRate, GradeRule, Rate, Rule
+
+REFERRAL_CONFIG_CACHE_KEY = getattr(settings, 'REFERRAL_CONFIG_CACHE_KEY', 'referral_config_version')
+REFERRAL_CONFIG_CHECK_INTERVAL = getattr(settings, 'REFERRAL_CONFIG_CHECK_INTERVAL', 0)
+
+
+def get_referral_limit():
+    return getattr(settings, 'REFERRAL_DOWNLINE_LIMIT', None) or Referral.limit
+
+
+def get_grade_rates():
+    """ Return {grade_id: [fee rate by upline level]}, Rate slug order is the level """
+    levels = {pk: idx for idx, pk in enumerate(
+        Rate.objects.order_by('slug').values_list('pk', flat=True))}
+    grade_rates = {}
+    for grade_id, rate_id, fee_rate in GradeRate.objects.values_list('grade_id', 'rate_id', 'fee_rate'):
+        rates = grade_rates.setdefault(grade_id, [None] * len(levels))
+        rates[levels[rate_id]] = fee_rate
+    return grade_rates
+
+
+class ReferralConfig:
+    """
+        Process local snapshot of referral fee configuration. The snapshot
+        is reloaded when the version number in the shared cache changes,
+        so reads never touch configuration tables until it is bumped.
+    """
+
+    def __init__(self, key=REFERRAL_CONFIG_CACHE_KEY, interval=REFERRAL_CONFIG_CHECK_INTERVAL):
+        self.key = key
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.version = None
+        self.values = None
+        self.checked_at = 0
+
+    def load(self):
+        from .feeschema import REFERRAL_FLAT_CAMPAIGN_RATE, REFERRAL_FLAT_UPLINES_RATE
+        return {
+            'limit': get_referral_limit(),
+            'campaign_rate': REFERRAL_FLAT_CAMPAIGN_RATE,
+            'uplines_rate': list(REFERRAL_FLAT_UPLINES_RATE),
+            'grade_rates': get_grade_rates(),
+        }
+
+    def get_version(self):
+        version = cache.get(self.key)
+        if version is None:
+            cache.add(self.key, 1, None)
+            version = cache.get(self.key, 1)
+        return version
+
+    def get(self, name):
+        now = time.monotonic()
+        with self.lock:
+            if self.values is None or now - self.checked_at >= self.interval:
+                version = self.get_version()
+                if self.values is None or version != self.version:
+                    self.values = self.load()
+                    self.version = version
+                self.checked_at = now
+            return self.values[name]
+
+    def invalidate(self):
+        """ Bump the shared version once the change is committed """
+        transaction.on_commit(self.bump)
+
+    def bump(self):
+        with self.lock:
+            self.values = None
+        try:
+            cache.incr(self.key)
+        except ValueError:
+            cache.set(self.key, 1, None)
+
+
+referral_config = ReferralConfig()
+
+
+@receiver(post_save, sender=Grade)
+@receiver(post_delete, sender=Grade)
+@receiver(post_save, sender=GradeRate)
+@receiver(post_delete, sender=GradeRate)
+@receiver(post_save, sender=GradeRule)
+@receiver(post_delete, sender=GradeRule)
+@receiver(post_save, sender=Rate)
+@receiver(post_delete, sender=Rate)
+@receiver(post_save, sender=Rule)
+@receiver(post_delete, sender=Rule)
+def invalidate_referral_config(sender, **kwargs):
+    referral_config.invalidate()
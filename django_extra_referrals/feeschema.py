@@ -1,12 +1,18 @@
 from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
+from django.contrib.contenttypes.models import ContentType
+from django.db import models, transaction as db_transaction
 from django.utils import timezone, translation
-from django_extra_referrals.models import Transaction as ReferralTransaction
+from django_extra_referrals.models import (
+    Transaction as ReferralTransaction, TransactionArchive, Leaderboard, Referral
+)
+from django_extra_referrals.config import referral_config
 
-SCHEMA_AVAILABLE = ['FLAT']
+SCHEMA_AVAILABLE = ['FLAT', 'GRADE']
 REFERRAL_SCHEMA = getattr(settings, 'REFERRAL_SCHEMA', 'FLAT')
 REFERRAL_FLAT_CAMPAIGN_RATE = getattr(settings, 'REFERRAL_CAMPAIGN_RATE', 4)
 REFERRAL_FLAT_UPLINES_RATE = getattr(settings, 'REFERRAL_UPLINES_RATE', [5, 2, 1])
+REFERRAL_DEFERRED_SETTLEMENT = getattr(settings, 'REFERRAL_DEFERRED_SETTLEMENT', False)
 
 if REFERRAL_SCHEMA not in SCHEMA_AVAILABLE:
     raise ImproperlyConfigured(
@@ -21,6 +27,7 @@ _ = translation.ugettext_lazy
 class FeeSchema:
     referral = None
     transaction_class = ReferralTransaction
+    archive_class = TransactionArchive
 
     def __init__(self, obj=None):
         if not obj.referral:
@@ -39,24 +46,184 @@ class FeeSchema:
     def get_campaign_rates(self):
         raise NotImplemented
 
+    def lock_referral(self, referral):
+        """ Lock referral row and load its current balance """
+        referral.balance = Referral._base_manager.select_for_update().filter(
+            pk=referral.pk
+        ).values_list('balance', flat=True).get()
+        return referral
+
     def post_referral_transaction(self, referral, rate, flow):
-        transaction = ReferralTransaction(
-            flow=flow,
-            content_object=self.instance,
-            rate=rate,
-            amount=self.instance.amount,
-            referral=referral,
-            is_verified=True,
-            verified_at=timezone.now(),
-            note='%s %s' % (
-                self.opts.model_name.title(),
-                self.instance.inner_id
+        # Deferred commissions are appended as pending, balance is left to settlement
+        deferred = REFERRAL_DEFERRED_SETTLEMENT and flow == 'IN'
+        with db_transaction.atomic():
+            if not deferred:
+                # Settlement adds to the balance concurrently, chain on the locked row
+                self.lock_referral(referral)
+            transaction = ReferralTransaction(
+                flow=flow,
+                content_object=self.instance,
+                rate=rate,
+                amount=self.instance.amount,
+                referral=referral,
+                is_verified=True,
+                is_settled=not deferred,
+                verified_at=timezone.now(),
+                note='%s %s' % (
+                    self.opts.model_name.title(),
+                    self.instance.inner_id
+                )
             )
-        )
-        transaction.save()
-        referral.update_balance(transaction.balance)
+            transaction.save()
+            if not deferred:
+                referral.update_balance(transaction.balance)
         return transaction
 
+    @classmethod
+    def settle_transactions(cls, referral_ids):
+        """
+            Fold pending commissions of referrals into their balance. The
+            balance chain follows (created_at, inner_id) like
+            recompute_referral_balances, so every row from the oldest
+            pending one on is rechained in one bulk update and each
+            referral balance gets one UPDATE. Return settled row count.
+        """
+        with db_transaction.atomic():
+            referrals = Referral.objects.select_for_update().filter(
+                pk__in=referral_ids
+            ).order_by('pk').only('id', 'balance').in_bulk()
+            starts = dict(cls.transaction_class.objects.filter(
+                referral_id__in=list(referrals), is_settled=False
+            ).order_by().values('referral_id').annotate(
+                start=models.Min('created_at')
+            ).values_list('referral_id', 'start'))
+            if not starts:
+                return 0
+            window = models.Q()
+            for referral_id, start in starts.items():
+                window |= models.Q(referral_id=referral_id, created_at__gte=start)
+            rows = list(cls.transaction_class.objects.filter(window).order_by(
+                'created_at', 'inner_id'
+            ).only('id', 'referral_id', 'flow', 'total', 'old_balance', 'balance', 'is_settled'))
+            # Referral balance closes the settled chain, walk back to the window opening
+            balances = {pk: referrals[pk].balance for pk in starts}
+            for trx in rows:
+                if trx.is_settled:
+                    balances[trx.referral_id] -= -trx.total if trx.flow == 'OUT' else trx.total
+            totals = {}
+            settled = 0
+            for trx in rows:
+                signed = -trx.total if trx.flow == 'OUT' else trx.total
+                trx.old_balance = balances[trx.referral_id]
+                trx.balance = balances[trx.referral_id] = trx.old_balance + signed
+                if not trx.is_settled:
+                    trx.is_settled = True
+                    settled += 1
+                    totals[trx.referral_id] = totals.get(trx.referral_id, 0) + signed
+            cls.transaction_class.objects.bulk_update(
+                rows, ['old_balance', 'balance', 'is_settled'], batch_size=500)
+            for referral_id, total in totals.items():
+                Referral.objects.filter(pk=referral_id).update(
+                    balance=models.F('balance') + total)
+        return settled
+
+    @classmethod
+    def cancel_transactions(cls, instances, flow):
+        """
+            Reverse the outstanding ``flow`` postings of many instances of
+            one model at once, one reversal per referral and instance.
+            Affected referrals are locked in primary key order, reversals are
+            bulk inserted and each referral balance gets one UPDATE.
+        """
+        reverse_flow = {'IN': 'OUT', 'OUT': 'IN'}
+        if flow not in ['IN', 'OUT']:
+            raise ValueError('flow must be IN or OUT')
+        instances = {str(obj.pk): obj for obj in instances}
+        if not instances:
+            return []
+        obj = next(iter(instances.values()))
+        opts = obj._meta
+        content_type = ContentType.objects.get_for_model(obj)
+
+        lookup = {
+            'content_type': content_type,
+            'object_id__in': list(instances),
+            'flow__in': [flow, reverse_flow[flow]],
+        }
+        with db_transaction.atomic():
+            # Postings of closed years live in the archive, they are settled and older
+            archived = list(cls.archive_class.objects.filter(**lookup).order_by('created_at', 'pk'))
+            live = list(cls.transaction_class.objects.filter(**lookup).order_by('created_at', 'pk'))
+            # Earlier confirm/cancel cycles already reversed part of the
+            # postings, only the net outstanding amount is reversed
+            outstanding = {}
+            for trx in archived + live:
+                sign = 1 if trx.flow == flow else -1
+                key = (trx.referral_id, trx.object_id)
+                total, amount, latest = outstanding.get(key, (0, 0, None))
+                outstanding[key] = (
+                    total + sign * trx.total,
+                    amount + sign * trx.amount,
+                    trx if trx.flow == flow else latest)
+            outstanding = {key: value for key, value in outstanding.items() if value[0] > 0}
+            referral_ids = {referral_id for referral_id, _ in outstanding}
+            referrals = Referral.objects.select_for_update().filter(
+                pk__in=referral_ids
+            ).order_by('pk').in_bulk()
+            pending_ids = {trx.referral_id for trx in live if not trx.is_settled} & referral_ids
+            if pending_ids:
+                # Reversals are posted settled, settle what they reverse first
+                cls.settle_transactions(pending_ids)
+                referrals = Referral.objects.filter(pk__in=referral_ids).in_bulk()
+
+            totals = {}
+            for (referral_id, _), (total, _, _) in outstanding.items():
+                totals[referral_id] = totals.get(referral_id, 0) + total
+            if reverse_flow[flow] == 'OUT':
+                for referral_id, total in totals.items():
+                    referral = referrals[referral_id]
+                    if total > referral.balance:
+                        raise ValueError("%s amount too large, %s balance is %s" % (
+                            opts.model_name, str(referral.account), referral.balance
+                        ))
+
+            now = timezone.now()
+            reversals = []
+            for (referral_id, object_id), (total, amount, latest) in outstanding.items():
+                referral = referrals[referral_id]
+                reversal = cls.transaction_class(
+                    flow=reverse_flow[flow],
+                    content_type=content_type,
+                    object_id=object_id,
+                    rate=latest.rate,
+                    amount=amount,
+                    total=total,
+                    referral=referral,
+                    is_verified=True,
+                    verified_at=now,
+                    note='%s %s' % (
+                        opts.model_name.title(),
+                        instances[object_id].inner_id
+                    )
+                )
+                # Running balance chain, referral.balance is only kept in memory here
+                referral.balance = reversal.calculate_balance()
+                reversals.append(reversal)
+            cls.transaction_class.bulk_update_inner_id(reversals)
+            cls.transaction_class.objects.bulk_create(reversals)
+
+            sign = 1 if reverse_flow[flow] == 'IN' else -1
+            for referral_id, total in totals.items():
+                Referral.objects.filter(pk=referral_id).update(
+                    balance=models.F('balance') + sign * total)
+            if flow == 'IN':
+                scores = {}
+                for (referral_id, _), (_, amount, _) in outstanding.items():
+                    scores[referral_id] = scores.get(referral_id, 0) + amount
+                for referral_id, score in scores.items():
+                    Leaderboard.objects.add_score(referrals[referral_id], -score)
+        return reversals
+
 
 class FlatFeeSchema(FeeSchema):
     """ Fee calculator for flat based fee"""
@@ -66,8 +233,8 @@ class FlatFeeSchema(FeeSchema):
 
     def __init__(self, obj=None):
         self.rate_withdraw = 100
-        self.rate_campaign = REFERRAL_FLAT_CAMPAIGN_RATE
-        self.rate_uplines = REFERRAL_FLAT_UPLINES_RATE
+        self.rate_campaign = referral_config.get('campaign_rate')
+        self.rate_uplines = referral_config.get('uplines_rate')
         super().__init__(obj)
 
     def get_upline_rates(self):
@@ -76,43 +243,56 @@ class FlatFeeSchema(FeeSchema):
     def get_campaign_rates(self):
         return self.rate_campaign
 
+    def get_upline_rate(self, upline, idx):
+        return self.get_upline_rates()[idx]
+
     def receive_referral_balance(self):
         if self.referral:
             uplines = self.referral.get_uplines()
-            for idx in range(uplines.count()):
-                rate = self.get_upline_rates()[idx]
-                upline = uplines[idx]
+            for idx, upline in enumerate(uplines):
+                rate = self.get_upline_rate(upline, idx)
                 self.post_referral_transaction(upline, rate, 'IN')
+                Leaderboard.objects.add_score(upline, self.amount)
 
         if self.campaigner and not self.referral:
             rate = self.rate_campaign
             self.post_referral_transaction(self.campaigner, rate, 'IN')
+            Leaderboard.objects.add_score(self.campaigner, self.amount)
 
     def send_referral_balance(self):
-        if self.amount > self.referral.balance:
-            raise ValueError("%s amount too large, %s balance is %s" % (
-                self.opts.verbose_name, str(self.referral.account), self.referral.balance
-            ))
-        self.post_referral_transaction(self.referral, 100, 'OUT')
+        with db_transaction.atomic():
+            self.lock_referral(self.referral)
+            if self.amount > self.referral.balance:
+                raise ValueError("%s amount too large, %s balance is %s" % (
+                    self.opts.verbose_name, str(self.referral.account), self.referral.balance
+                ))
+            self.post_referral_transaction(self.referral, 100, 'OUT')
 
     def cancel_transaction(self, flow):
-        reverse_flow = {'IN': 'OUT', 'OUT': 'IN'}
-        if flow not in ['IN', 'OUT']:
-            raise ValueError('flow must be IN or OUT')
+        return self.cancel_transactions([self.instance], flow)
 
-        transactions = self.transaction_class.objects.filter(
-            object_id=self.instance.id, flow=flow
-        )
-        for trx in transactions:
-            if reverse_flow[flow] == 'OUT' and trx.total > trx.referral.balance:
-                raise ValueError("%s amount too large, %s balance is %s" % (
-                    self.opts.model_name, str(trx.referral.account), trx.referral.balance
-                ))
-            self.post_referral_transaction(trx.referral, trx.rate, reverse_flow[flow])
+
+class GradeFeeSchema(FlatFeeSchema):
+    """
+        Fee calculator for grade based fee, each upline earns the rate of
+        its cached grade, ungraded uplines fall back to flat rates.
+    """
+
+    def __init__(self, obj=None):
+        super().__init__(obj)
+        self.grade_rates = referral_config.get('grade_rates')
+
+    def get_upline_rate(self, upline, idx):
+        rates = self.grade_rates.get(upline.grade_id) or []
+        rate = rates[idx] if idx < len(rates) else None
+        if rate is None:
+            return super().get_upline_rate(upline, idx)
+        return rate
 
 
 def get_fee_schema_class():
     schema_class = {
-        'FLAT': FlatFeeSchema
+        'FLAT': FlatFeeSchema,
+        'GRADE': GradeFeeSchema
     }
     return schema_class[REFERRAL_SCHEMA]
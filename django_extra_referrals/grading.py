@@ -0,0 +1,134 @@
+import numpy as np
+from django.conf import settings
+from django.db import models
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from django_extra_referrals.models import Grade, Rule, GradeRule, Referral
+
+# Rule slug to referral metric, each GradeRule min/max is checked against it
+REFERRAL_GRADE_METRICS = getattr(settings, 'REFERRAL_GRADE_METRICS', {
+    'A': 'network_total',
+    'B': 'network_count',
+    'C': 'downlines',
+    'D': 'descendants',
+    'E': 'balance',
+})
+# Minimum weighted percentage of passed rules needed to get a grade
+REFERRAL_GRADE_PASS_SCORE = getattr(settings, 'REFERRAL_GRADE_PASS_SCORE', 100)
+
+
+def get_metric_expressions():
+    downlines = Referral.objects.filter(
+        parent=models.OuterRef('pk')
+    ).order_by().values('parent').annotate(total=models.Count('pk')).values('total')[:1]
+    return {
+        'network_total': models.F('network_total'),
+        'network_count': models.F('network_count'),
+        'balance': models.F('balance'),
+        'level': models.F('level'),
+        'descendants': (models.F('rght') - models.F('lft') - 1) / 2,
+        'downlines': Coalesce(
+            models.Subquery(downlines, output_field=models.IntegerField()),
+            models.Value(0)),
+    }
+
+
+class ReferralGrader:
+    """
+        Classify referrals into grades by evaluating GradeRule thresholds.
+        Metrics are loaded in chunks into arrays and every grade rule is
+        compared at once, grades are checked in slug order and the first
+        qualified grade wins.
+    """
+    batch_size = 10000
+
+    def __init__(self, queryset=None, pass_score=None, batch_size=None):
+        self.queryset = queryset if queryset is not None else Referral.objects.all()
+        self.pass_score = REFERRAL_GRADE_PASS_SCORE if pass_score is None else pass_score
+        self.batch_size = batch_size or self.batch_size
+        self.load_rules()
+
+    def load_rules(self):
+        self.grades = list(Grade.objects.order_by('slug').values_list('pk', flat=True))
+        rules = [
+            rule for rule in Rule.objects.order_by('slug')
+            if rule.slug in REFERRAL_GRADE_METRICS
+        ]
+        self.metrics = [REFERRAL_GRADE_METRICS[rule.slug] for rule in rules]
+        shape = (len(self.grades), len(rules))
+        self.min_values = np.zeros(shape)
+        self.max_values = np.zeros(shape)
+        self.defined = np.zeros(shape, dtype=bool)
+
+        grade_index = {pk: idx for idx, pk in enumerate(self.grades)}
+        rule_index = {rule.pk: idx for idx, rule in enumerate(rules)}
+        grade_rules = GradeRule.objects.filter(
+            rule_id__in=rule_index
+        ).values_list('grade_id', 'rule_id', 'min_value', 'max_value')
+        for grade_id, rule_id, min_value, max_value in grade_rules:
+            pos = grade_index[grade_id], rule_index[rule_id]
+            self.min_values[pos] = float(min_value)
+            self.max_values[pos] = float(max_value)
+            self.defined[pos] = True
+
+        weights = np.array([float(rule.weighting) for rule in rules])
+        if not weights.any():
+            weights = np.ones(len(rules))
+        self.weights = np.where(self.defined, weights, 0)
+        self.total_weights = self.weights.sum(axis=1)
+
+    def get_metric_queryset(self):
+        expressions = get_metric_expressions()
+        annotations = {
+            'metric_%s' % idx: expressions[metric]
+            for idx, metric in enumerate(self.metrics)
+        }
+        return self.queryset.order_by('pk').annotate(**annotations).values_list(
+            'pk', 'grade_id', *annotations.keys())
+
+    def evaluate(self, values):
+        """
+            Return grade index for each metrics row, -1 when no grade qualified.
+            ``values`` is an array shaped (referrals, rules).
+        """
+        if not len(self.grades):
+            return np.full(len(values), -1)
+        values = values[:, None, :]
+        passed = (values >= self.min_values) & (values <= self.max_values) & self.defined
+        scores = (passed * self.weights).sum(axis=2)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            scores = np.where(self.total_weights > 0, scores * 100 / self.total_weights, 0)
+        qualified = (scores >= self.pass_score) & (self.total_weights > 0)
+        return np.where(qualified.any(axis=1), qualified.argmax(axis=1), -1)
+
+    def get_chunks(self):
+        chunk = []
+        for row in self.get_metric_queryset().iterator(chunk_size=self.batch_size):
+            chunk.append(row)
+            if len(chunk) == self.batch_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def grade_chunk(self, rows):
+        """ Update changed grades of rows, one UPDATE per grade """
+        if self.metrics:
+            values = np.array([row[2:] for row in rows], dtype=float)
+            indexes = self.evaluate(values)
+        else:
+            indexes = np.full(len(rows), -1)
+        changes = {}
+        for row, idx in zip(rows, indexes):
+            grade_id = self.grades[idx] if idx >= 0 else None
+            if grade_id != row[1]:
+                changes.setdefault(grade_id, []).append(row[0])
+        now = timezone.now()
+        for grade_id, pks in changes.items():
+            Referral.objects.filter(pk__in=pks).update(grade_id=grade_id, graded_at=now)
+        return sum(len(pks) for pks in changes.values())
+
+    def grade(self):
+        """ Grade all referrals of queryset, return number of changed referrals """
+        return sum(self.grade_chunk(rows) for rows in self.get_chunks())
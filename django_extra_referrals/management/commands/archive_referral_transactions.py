@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from django_extra_referrals.models import TransactionArchive
+
+
+class Command(BaseCommand):
+    help = "Move referral transactions of closed years into the archive table"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--before', type=int,
+            help="Archive years before this one, default to current year")
+        parser.add_argument(
+            '--batch-size', type=int, default=5000,
+            help="Number of transactions moved per transaction")
+
+    def handle(self, *args, **options):
+        current_year = timezone.localtime().year
+        year = options['before'] or current_year
+        if year > current_year:
+            raise CommandError("Year %s is not closed yet" % year)
+        before, _ = TransactionArchive.objects.get_year_range(year)
+        moved = TransactionArchive.objects.archive(before, max(options['batch_size'], 1))
+        self.stdout.write(self.style.SUCCESS("%s transactions archived" % moved))
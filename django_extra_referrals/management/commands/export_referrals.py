@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from django_extra_referrals.models import Referral
+from django_extra_referrals.treeio import EXPORT_FIELDS, write_tree
+
+
+class Command(BaseCommand):
+    help = "Export the referral tree to a compact binary dump"
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Dump file path")
+        parser.add_argument(
+            '--chunk-size', type=int, default=10000,
+            help="Number of referrals fetched and written at once")
+
+    def handle(self, *args, **options):
+        chunk_size = max(options['chunk_size'], 1)
+        rows = Referral.objects.order_by('tree_id', 'lft').values_list(
+            *EXPORT_FIELDS).iterator(chunk_size=chunk_size)
+        with open(options['path'], 'wb') as stream:
+            count = write_tree(stream, rows, chunk_size)
+        self.stdout.write(self.style.SUCCESS("%s referrals exported" % count))
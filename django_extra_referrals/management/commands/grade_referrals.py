@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from django_extra_referrals.grading import ReferralGrader
+
+
+class Command(BaseCommand):
+    help = "Evaluate grade rules for all referrals and store their grade"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=ReferralGrader.batch_size,
+            help="Number of referrals evaluated per chunk")
+
+    def handle(self, *args, **options):
+        grader = ReferralGrader(batch_size=options['batch_size'])
+        changed = grader.grade()
+        self.stdout.write(self.style.SUCCESS("%s referrals regraded" % changed))
@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import models, transaction
+
+from django_numerators.models import NumeratorReset
+from django_extra_referrals.models import Referral, DownlineCounter
+from django_extra_referrals.treeio import read_tree
+
+
+class Command(BaseCommand):
+    help = "Import a binary referral tree dump next to the existing trees"
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Dump file path")
+        parser.add_argument(
+            '--batch-size', type=int, default=5000,
+            help="Number of referrals inserted per query")
+
+    def bump_numerators(self, reg_numbers):
+        """ Move numerator counters past the imported reg numbers """
+        for created_at, reg_number in reg_numbers.values():
+            numerator = Referral(created_at=created_at).get_numerator()
+            if numerator.counter < reg_number:
+                numerator.counter = reg_number
+                numerator.save()
+
+    def handle(self, *args, **options):
+        batch_size = max(options['batch_size'], 1)
+        count = 0
+        reg_numbers = {}
+        with transaction.atomic(), open(options['path'], 'rb') as stream:
+            tree_id_offset = Referral.objects.aggregate(
+                tree_id=models.Max('tree_id'))['tree_id'] or 0
+            batch = []
+            try:
+                for values in read_tree(stream, tree_id_offset, batch_size):
+                    batch.append(Referral(**values))
+                    if values['reg_number']:
+                        date = values['created_at']
+                        key = (date.year, date.month if Referral.reset_mode == NumeratorReset.MONTHLY else 0)
+                        if values['reg_number'] > reg_numbers.get(key, (None, 0))[1]:
+                            reg_numbers[key] = (date, values['reg_number'])
+                    if len(batch) >= batch_size:
+                        Referral.objects.bulk_create(batch)
+                        count += len(batch)
+                        batch = []
+            except ValueError as err:
+                raise CommandError(err)
+            Referral.objects.bulk_create(batch)
+            count += len(batch)
+            self.bump_numerators(reg_numbers)
+            # bulk_create skips the signals, count the imported trees only
+            DownlineCounter.objects.rebuild(batch_size, min_tree_id=tree_id_offset + 1)
+        self.stdout.write(self.style.SUCCESS("%s referrals imported" % count))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from django_extra_referrals.models import DownlineCounter
+
+
+class Command(BaseCommand):
+    help = "Rebuild per level downline counters of every referral"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=5000,
+            help="Number of referrals fetched and counters inserted at once")
+
+    def handle(self, *args, **options):
+        created = DownlineCounter.objects.rebuild(max(options['batch_size'], 1))
+        self.stdout.write(self.style.SUCCESS("%s downline counters rebuilt" % created))
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from django_extra_referrals.models import Leaderboard, Transaction, TransactionArchive
+
+
+class Command(BaseCommand):
+    help = "Rebuild referral leaderboard of past periods from the transaction ledger"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'periods', nargs='*',
+            help="Periods formatted as YYYY-MM, default to current period")
+        parser.add_argument(
+            '--all', action='store_true',
+            help="Rebuild every period found in the ledger")
+
+    def get_periods(self, options):
+        if options['all']:
+            periods = set()
+            for model in (TransactionArchive, Transaction):
+                dates = model.objects.datetimes('created_at', 'month')
+                periods.update(Leaderboard.objects.get_period(date) for date in dates)
+            return sorted(periods)
+        return options['periods'] or [Leaderboard.objects.get_period()]
+
+    def handle(self, *args, **options):
+        for period in self.get_periods(options):
+            try:
+                Leaderboard.objects.get_period_range(period)
+            except ValueError:
+                raise CommandError("Invalid period %s, use YYYY-MM" % period)
+            count = Leaderboard.objects.rebuild(period)
+            self.stdout.write(self.style.SUCCESS("%s: %s referrals ranked" % (period, count)))
@@ -0,0 +1,84 @@
+from django.core.management.base import BaseCommand
+from django.db import models, transaction
+
+from django_extra_referrals.models import Referral, Transaction, TransactionArchive
+
+
+class Command(BaseCommand):
+    help = "Recompute referral transaction balance chains and referral balances"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size', type=int, default=500,
+            help="Number of referrals locked and recomputed per transaction")
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help="Report drift without writing")
+
+    def get_chain_queryset(self, referral_ids):
+        """ Running balance per referral, one window query per chunk """
+        signed_total = models.Case(
+            models.When(flow='OUT', then=-models.F('total')),
+            default=models.F('total'),
+            output_field=models.DecimalField(max_digits=15, decimal_places=2))
+        running = models.Window(
+            # Float aggregate keeps Django 3.0 from wrapping SUM() in a CAST
+            # before OVER on SQLite, the window output is still decimal
+            expression=models.Sum(signed_total, output_field=models.FloatField()),
+            partition_by=[models.F('referral_id')],
+            order_by=[models.F('created_at').asc(), models.F('inner_id').asc()],
+            # ROWS frame, a RANGE frame would sum transactions sharing created_at
+            frame=models.RowRange(start=None, end=0),
+            output_field=models.DecimalField(max_digits=15, decimal_places=2))
+        # Pending commissions get their chain on settlement
+        return Transaction.objects.filter(
+            referral_id__in=referral_ids, is_settled=True
+        ).annotate(running_balance=running).order_by(
+            'referral_id', 'created_at', 'inner_id'
+        ).only('id', 'referral_id', 'flow', 'total', 'old_balance', 'balance')
+
+    def recompute_chunk(self, referral_ids, dry_run):
+        with transaction.atomic():
+            referrals = Referral.objects.select_for_update().filter(
+                pk__in=referral_ids).order_by('pk').only('id', 'balance').in_bulk()
+            drifted = []
+            # Live chains continue from the closing balance of archived years
+            opening = TransactionArchive.objects.get_signed_totals(list(referrals))
+            balances = {pk: opening.get(pk) or 0 for pk in referrals}
+            for trx in self.get_chain_queryset(list(referrals)):
+                signed = -trx.total if trx.flow == 'OUT' else trx.total
+                running = (opening.get(trx.referral_id) or 0) + trx.running_balance
+                if trx.old_balance != running - signed or trx.balance != running:
+                    trx.old_balance = running - signed
+                    trx.balance = running
+                    drifted.append(trx)
+                balances[trx.referral_id] = running
+
+            stale = []
+            for pk, referral in referrals.items():
+                if referral.balance != balances[pk]:
+                    referral.balance = balances[pk]
+                    stale.append(referral)
+            if not dry_run:
+                Transaction.objects.bulk_update(drifted, ['old_balance', 'balance'], batch_size=500)
+                Referral.objects.bulk_update(stale, ['balance'], batch_size=500)
+        return len(drifted), len(stale)
+
+    def handle(self, *args, **options):
+        chunk_size = max(options['chunk_size'], 1)
+        referral_ids = Referral.objects.order_by('pk').values_list('pk', flat=True)
+        transactions_fixed = referrals_fixed = 0
+        last_pk = None
+        while True:
+            queryset = referral_ids if last_pk is None else referral_ids.filter(pk__gt=last_pk)
+            chunk = list(queryset[:chunk_size])
+            if not chunk:
+                break
+            last_pk = chunk[-1]
+            fixed = self.recompute_chunk(chunk, options['dry_run'])
+            transactions_fixed += fixed[0]
+            referrals_fixed += fixed[1]
+        self.stdout.write(self.style.SUCCESS(
+            "%s transactions and %s referrals %s" % (
+                transactions_fixed, referrals_fixed,
+                'drifted' if options['dry_run'] else 'fixed')))
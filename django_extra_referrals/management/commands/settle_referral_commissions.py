@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from django_extra_referrals.feeschema import get_fee_schema_class
+from django_extra_referrals.models import Transaction
+
+
+class Command(BaseCommand):
+    help = "Fold pending referral commissions into referral balances"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help="Number of referrals settled per transaction")
+
+    def handle(self, *args, **options):
+        schema = get_fee_schema_class()
+        batch_size = max(options['batch_size'], 1)
+        referral_ids = list(Transaction.objects.filter(
+            is_settled=False
+        ).order_by('referral_id').values_list('referral_id', flat=True).distinct())
+        settled = 0
+        for idx in range(0, len(referral_ids), batch_size):
+            settled += schema.settle_transactions(referral_ids[idx:idx + batch_size])
+        self.stdout.write(self.style.SUCCESS(
+            "%s transactions of %s referrals settled" % (settled, len(referral_ids))))
@@ -0,0 +1,70 @@
+import numpy as np
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from django_extra_referrals.feeschema import REFERRAL_FLAT_CAMPAIGN_RATE, REFERRAL_FLAT_UPLINES_RATE
+from django_extra_referrals.models import Referral, get_receivable_models
+from django_extra_referrals.simulator import CommissionSimulator
+
+
+def rate_list(value):
+    try:
+        return [float(x) for x in value.split(',') if x.strip()]
+    except ValueError:
+        raise CommandError("Rates must be comma separated numbers, got %s" % value)
+
+
+class Command(BaseCommand):
+    help = "Replay paid receivables under candidate commission rates, nothing is written"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--uplines-rate', action='append', type=rate_list, dest='uplines_rates',
+            help="Comma separated upline rates, repeat for each scenario (e.g. 5,2,1)")
+        parser.add_argument(
+            '--campaign-rate', action='append', type=float, dest='campaign_rates',
+            help="Campaign rate, once for all scenarios or once per scenario")
+        parser.add_argument(
+            '--model', action='append', dest='models',
+            help="Receivable model label, default to every receivable model")
+        parser.add_argument('--since', type=parse_date, help="First date, YYYY-MM-DD")
+        parser.add_argument('--until', type=parse_date, help="Last date, YYYY-MM-DD")
+        parser.add_argument('--depth', type=int, help="Upline depth, default to referral limit")
+        parser.add_argument('--top', type=int, default=10, help="Referrals shown per scenario")
+
+    def get_querysets(self, options):
+        models = [apps.get_model(label) for label in options['models'] or []]
+        querysets = []
+        for model in models or get_receivable_models():
+            queryset = model.objects.filter(is_paid=True)
+            if options['since']:
+                queryset = queryset.filter(created_at__date__gte=options['since'])
+            if options['until']:
+                queryset = queryset.filter(created_at__date__lte=options['until'])
+            querysets.append(queryset)
+        return querysets
+
+    def handle(self, *args, **options):
+        uplines_rates = options['uplines_rates'] or [REFERRAL_FLAT_UPLINES_RATE]
+        campaign_rates = options['campaign_rates'] or [REFERRAL_FLAT_CAMPAIGN_RATE]
+        if len(campaign_rates) not in (1, len(uplines_rates)):
+            raise CommandError("Give one campaign rate or one per uplines rate")
+
+        simulator = CommissionSimulator(self.get_querysets(options), depth=options['depth'])
+        payouts = simulator.simulate(uplines_rates, campaign_rates)
+        self.stdout.write("%s receivables, total %.2f" % (
+            simulator.receivable_count, simulator.receivable_total))
+
+        for idx, uplines_rate in enumerate(uplines_rates):
+            payout = payouts[idx]
+            campaign_rate = campaign_rates[idx if len(campaign_rates) > 1 else 0]
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                "Uplines %s, campaign %s" % (uplines_rate, campaign_rate)))
+            self.stdout.write("  total payout %.2f to %s referrals" % (
+                payout.sum(), np.count_nonzero(payout)))
+            top = [i for i in np.argsort(payout)[::-1][:options['top']] if payout[i] > 0]
+            names = Referral.objects.in_bulk([simulator.referral_ids[i] for i in top])
+            for i in top:
+                referral = names[simulator.referral_ids[i]]
+                self.stdout.write("  %s %.2f" % (referral.inner_id, payout[i]))
@@ -1,7 +1,7 @@
 from django.conf import settings
 from django.apps import apps
 
-REFERRAL_MODEL = getattr(settings, 'REFERRAL_MODEL', 'django_referrals.Referral')
+REFERRAL_MODEL = getattr(settings, 'REFERRAL_MODEL', 'django_extra_referrals.Referral')
 REFERRAL_COOKIE_KEY = getattr(settings, 'REFERRAL_COOKIE_KEY', 'ref_id')
 REFERRAL_PARAM_KEY = getattr(settings, 'REFERRAL_PARAM_KEY', 'ref_id')
 REFERRAL_MAX_DAY = getattr(settings, 'REFERRAL_COOKIE_AGE', 7 * 24 * 60 * 60)
@@ -19,8 +19,10 @@ class ReferralLinkMiddleware:
         if cookie:
             try:
                 response.referral = Referral.objects.get(pk=cookie)
-            except Exception as err:
+            except Exception:
                 pass
+        if request.method == 'GET' and REFERRAL_PARAM_KEY in request.GET:
+            self.track_click(request.GET.get(REFERRAL_PARAM_KEY))
         if not cookie and request.method == 'GET' and REFERRAL_PARAM_KEY in request.GET:
             ref_id = request.GET.get(REFERRAL_PARAM_KEY)
             try:
@@ -29,3 +31,13 @@ class ReferralLinkMiddleware:
             except Referral.DoesNotExist:
                 pass
         return response
+
+    def track_click(self, ref_id):
+        from .tracking import click_buffer
+        click_buffer.add(ref_id)
+        if click_buffer.should_flush():
+            try:
+                click_buffer.flush()
+            except Exception:
+                # Clicks stay buffered, never fail the request
+                pass
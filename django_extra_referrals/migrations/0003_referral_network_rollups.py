@@ -0,0 +1,23 @@
+# Generated by Django 3.0.14 on 2026-10-19 15:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_extra_referrals', '0002_auto_20200409_0542'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='referral',
+            name='network_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Paid count of this referral and all of its downlines', verbose_name='Network count'),
+        ),
+        migrations.AddField(
+            model_name='referral',
+            name='network_total',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, help_text='Paid amount of this referral and all of its downlines', max_digits=15, verbose_name='Network total'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 3.0.14 on 2026-10-19 15:14
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_extra_referrals', '0003_referral_network_rollups'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='referral',
+            name='grade',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='referrals', to='django_extra_referrals.Grade', verbose_name='Grade'),
+        ),
+        migrations.AddField(
+            model_name='referral',
+            name='graded_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Graded at'),
+        ),
+    ]
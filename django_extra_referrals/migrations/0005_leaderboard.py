@@ -0,0 +1,38 @@
+# Generated by Django 3.0.14 on 2026-10-19 15:15
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_extra_referrals', '0004_referral_grade'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Leaderboard',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False, verbose_name='uuid')),
+                ('period', models.CharField(max_length=7, verbose_name='Period')),
+                ('score', models.DecimalField(decimal_places=2, default=0, max_digits=15, verbose_name='Score')),
+                ('modified_at', models.DateTimeField(default=django.utils.timezone.now, editable=False)),
+                ('referral', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leaderboards', to='django_extra_referrals.Referral', verbose_name='Referral')),
+            ],
+            options={
+                'verbose_name': 'Leaderboard',
+                'verbose_name_plural': 'Leaderboards',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='leaderboard',
+            index=models.Index(fields=['period', '-score'], name='django_extr_period_3fac30_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='leaderboard',
+            unique_together={('period', 'referral')},
+        ),
+    ]
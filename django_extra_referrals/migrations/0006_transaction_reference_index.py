@@ -0,0 +1,17 @@
+# Generated by Django 3.0.14 on 2026-10-19 15:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_extra_referrals', '0005_leaderboard'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['content_type', 'object_id', 'flow'], name='django_extr_content_28ad4d_idx'),
+        ),
+    ]
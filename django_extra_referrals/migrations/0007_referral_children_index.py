@@ -0,0 +1,17 @@
+# Generated by Django 3.0.14 on 2026-10-19 15:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_extra_referrals', '0006_transaction_reference_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='referral',
+            index=models.Index(fields=['parent', 'created_at', 'id'], name='django_extr_parent__d8cf99_idx'),
+        ),
+    ]
@@ -0,0 +1,90 @@
+# Generated by Django 3.0.14 on 2026-10-19 15:22
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+
+ARCHIVE_TABLE = 'django_extra_referrals_transactionarchive'
+
+ARCHIVE_INDEXES = [
+    models.Index(fields=['referral', 'created_at'], name='django_extr_archive_ref_idx'),
+    models.Index(fields=['content_type', 'object_id', 'flow'], name='django_extr_archive_obj_idx'),
+]
+
+POSTGRESQL_ARCHIVE_TABLE = """
+CREATE TABLE "{table}" (
+    "id" uuid NOT NULL,
+    "reg_number" integer NULL CHECK ("reg_number" >= 0),
+    "inner_id" varchar(50) NULL,
+    "flow" varchar(3) NOT NULL,
+    "referral_id" uuid NOT NULL,
+    "amount" numeric(15, 2) NOT NULL,
+    "rate" numeric(5, 2) NOT NULL,
+    "total" numeric(15, 2) NOT NULL,
+    "old_balance" numeric(15, 2) NOT NULL,
+    "balance" numeric(15, 2) NOT NULL,
+    "note" varchar(250) NULL,
+    "is_verified" boolean NOT NULL,
+    "created_at" timestamp with time zone NOT NULL,
+    "verified_at" timestamp with time zone NULL,
+    "content_type_id" integer NULL,
+    "object_id" varchar(100) NULL,
+    PRIMARY KEY ("id", "created_at")
+) PARTITION BY RANGE ("created_at");
+CREATE TABLE "{table}_default" PARTITION OF "{table}" DEFAULT;
+"""
+
+
+def create_archive_table(apps, schema_editor):
+    model = apps.get_model('django_extra_referrals', 'TransactionArchive')
+    if schema_editor.connection.vendor == 'postgresql':
+        # Yearly partitions are added by TransactionArchive.objects.ensure_partition
+        schema_editor.execute(POSTGRESQL_ARCHIVE_TABLE.format(table=ARCHIVE_TABLE))
+    else:
+        schema_editor.create_model(model)
+    for index in ARCHIVE_INDEXES:
+        schema_editor.add_index(model, index)
+
+
+def drop_archive_table(apps, schema_editor):
+    schema_editor.execute('DROP TABLE %s' % schema_editor.quote_name(ARCHIVE_TABLE))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('django_extra_referrals', '0007_referral_children_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TransactionArchive',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False, verbose_name='uuid')),
+                ('reg_number', models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='Reg number')),
+                ('inner_id', models.CharField(blank=True, editable=False, max_length=50, null=True, verbose_name='Inner ID')),
+                ('flow', models.CharField(choices=[('IN', 'In'), ('OUT', 'Out')], default='IN', max_length=3, verbose_name='Flow')),
+                ('referral', models.ForeignKey(db_constraint=False, db_index=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='archived_transactions', to='django_extra_referrals.Referral', verbose_name='Referral')),
+                ('amount', models.DecimalField(decimal_places=2, default=0, max_digits=15, verbose_name='Amount')),
+                ('rate', models.DecimalField(decimal_places=2, default=0.0, max_digits=5, verbose_name='Rate')),
+                ('total', models.DecimalField(decimal_places=2, default=0, max_digits=15, verbose_name='Total')),
+                ('old_balance', models.DecimalField(decimal_places=2, default=0, max_digits=15, verbose_name='Old Balance')),
+                ('balance', models.DecimalField(decimal_places=2, default=0, max_digits=15, verbose_name='Balance')),
+                ('note', models.CharField(blank=True, max_length=250, null=True, verbose_name='Note')),
+                ('is_verified', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, editable=False)),
+                ('verified_at', models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Verified at')),
+                ('content_type', models.ForeignKey(blank=True, db_constraint=False, db_index=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, to='contenttypes.ContentType', verbose_name='reference type')),
+                ('object_id', models.CharField(blank=True, max_length=100, null=True, verbose_name='reference id')),
+            ],
+            options={
+                'verbose_name': 'Archived transaction',
+                'verbose_name_plural': 'Archived transactions',
+                'ordering': ['-created_at'],
+                'managed': False,
+            },
+        ),
+        migrations.RunPython(create_archive_table, drop_archive_table),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 3.0.14 on 2026-10-19 15:24
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_extra_referrals', '0008_transactionarchive'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReferralLinkStat',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False, verbose_name='uuid')),
+                ('date', models.DateField(verbose_name='Date')),
+                ('clicks', models.PositiveIntegerField(default=0, verbose_name='Clicks')),
+                ('conversions', models.PositiveIntegerField(default=0, verbose_name='Conversions')),
+                ('referral', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='link_stats', to='django_extra_referrals.Referral', verbose_name='Referral')),
+            ],
+            options={
+                'verbose_name': 'Referral link stat',
+                'verbose_name_plural': 'Referral link stats',
+                'unique_together': {('referral', 'date')},
+            },
+        ),
+    ]
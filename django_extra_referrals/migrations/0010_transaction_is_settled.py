@@ -0,0 +1,22 @@
+# Generated by Django 3.0.14 on 2026-10-19 15:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_extra_referrals', '0009_referrallinkstat'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='transaction',
+            name='is_settled',
+            field=models.BooleanField(default=True, help_text='Pending commissions are folded into referral balance by settlement', verbose_name='Settled'),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(condition=models.Q(is_settled=False), fields=['referral'], name='django_extr_pending_idx'),
+        ),
+    ]
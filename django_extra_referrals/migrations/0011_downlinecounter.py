@@ -0,0 +1,30 @@
+# Generated by Django 3.0.14 on 2026-10-19 15:32
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_extra_referrals', '0010_transaction_is_settled'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DownlineCounter',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False, verbose_name='uuid')),
+                ('depth', models.PositiveSmallIntegerField(verbose_name='Depth')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='Count')),
+                ('referral', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='downline_counters', to='django_extra_referrals.Referral', verbose_name='Referral')),
+            ],
+            options={
+                'verbose_name': 'Downline counter',
+                'verbose_name_plural': 'Downline counters',
+                'ordering': ['depth'],
+                'unique_together': {('referral', 'depth')},
+            },
+        ),
+    ]
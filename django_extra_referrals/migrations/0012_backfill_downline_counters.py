@@ -0,0 +1,25 @@
+# Generated by Django 3.0.14 on 2026-10-19 17:05
+
+from django.db import migrations
+
+from django_extra_referrals.config import get_referral_limit
+from django_extra_referrals.rollups import rebuild_downline_counters
+
+
+def backfill_downline_counters(apps, schema_editor):
+    """ Counters added by 0011 start empty, count the existing trees """
+    rebuild_downline_counters(
+        apps.get_model('django_extra_referrals', 'Referral'),
+        apps.get_model('django_extra_referrals', 'DownlineCounter'),
+        get_referral_limit())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_extra_referrals', '0011_downlinecounter'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_downline_counters, migrations.RunPython.noop),
+    ]
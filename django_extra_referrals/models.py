@@ -1,8 +1,9 @@
 import uuid
 import enum
-from django.db import models
+from decimal import Decimal
+from django.apps import apps
+from django.db import models, transaction, connections, IntegrityError
 from django.utils import timezone, translation
-from django.conf import settings
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.models import ContentType
@@ -189,8 +190,103 @@ class GradeRule(models.Model):
         return "%s %s" % (self.grade.name, self.rule.name)
 
 
+NETWORK_SQL = """
+    WITH RECURSIVE network (origin_id, node_id, depth) AS (
+        SELECT {origin}, {node}, 1 FROM {table}
+        WHERE {origin} IN ({ids}) AND {parent} IS NOT NULL
+        UNION ALL
+        SELECT network.origin_id, step.{node}, network.depth + 1
+        FROM network INNER JOIN {table} step ON step.{join} = network.node_id
+        WHERE step.{parent} IS NOT NULL AND network.depth < %s
+    )
+    SELECT referral.*,
+        network.origin_id AS network_origin_id,
+        network.depth AS network_depth
+    FROM network INNER JOIN {table} referral ON referral.{pk} = network.node_id
+    ORDER BY network.origin_id, network.depth
+"""
+
+
 class ReferralManager(TreeManager):
-    pass
+
+    def get_referral_limit(self):
+        from .config import referral_config
+        return referral_config.get('limit')
+
+    def get_network_queryset(self, referrals, depth=None, uplines=True):
+        """
+            Uplines or downlines of many referrals with one WITH RECURSIVE
+            query over the parent column, independent of the MPTT fields.
+            Each row carries ``network_origin_id`` (raw column value of the
+            referral it was found for) and ``network_depth``.
+        """
+        ids = [getattr(referral, 'pk', referral) for referral in referrals]
+        if not ids:
+            return self.none()
+        connection = connections[self.db]
+        qn = connection.ops.quote_name
+        opts = self.model._meta
+        pk, parent = qn(opts.pk.column), qn(opts.get_field('parent').column)
+        sql = NETWORK_SQL.format(
+            table=qn(opts.db_table),
+            pk=pk,
+            parent=parent,
+            ids=', '.join(['%s'] * len(ids)),
+            # uplines walk up from pk to parent, downlines walk down from parent to pk
+            origin=pk if uplines else parent,
+            node=parent if uplines else pk,
+            join=pk if uplines else parent,
+        )
+        params = [opts.pk.get_db_prep_value(x, connection) for x in ids]
+        return self.raw(sql, params + [depth or self.get_referral_limit()])
+
+    def get_uplines_for(self, referrals, depth=None):
+        """ Return {referral pk: [uplines nearest first]} """
+        return self.group_network(self.get_network_queryset(referrals, depth, uplines=True))
+
+    def get_downlines_for(self, referrals, depth=None):
+        """ Return {referral pk: [downlines ordered by depth]} """
+        return self.group_network(self.get_network_queryset(referrals, depth, uplines=False))
+
+    def group_network(self, queryset):
+        to_python = self.model._meta.pk.to_python
+        network = {}
+        for referral in queryset:
+            network.setdefault(to_python(referral.network_origin_id), []).append(referral)
+        return network
+
+    def get_upline_queryset(self, referral, include_self=True):
+        """ Uplines of referral as one lft/rght range lookup within its tree """
+        if include_self:
+            lookups = {'lft__lte': referral.lft, 'rght__gte': referral.rght}
+        else:
+            lookups = {'lft__lt': referral.lft, 'rght__gt': referral.rght}
+        return self.get_queryset().filter(tree_id=referral.tree_id, **lookups)
+
+    def update_network_total(self, referral, amount, count=1):
+        """
+            Add paid amount to the network rollup of referral and
+            every upline above it with a single UPDATE
+        """
+        return self.get_upline_queryset(referral).update(
+            network_total=models.F('network_total') + amount,
+            network_count=models.F('network_count') + count,
+        )
+
+    def shift_network_total(self, parent_id, referral_id, sign=1):
+        """
+            Add (sign=1) or remove (sign=-1) the whole network rollup of
+            referral to parent and its uplines, when the subtree moves
+            in or out below parent
+        """
+        if not parent_id:
+            return 0
+        parent = self.get_queryset().filter(pk=parent_id).only('tree_id', 'lft', 'rght').first()
+        rollup = self.get_queryset().filter(pk=referral_id).values_list(
+            'network_total', 'network_count').first()
+        if parent is None or rollup is None or not any(rollup):
+            return 0
+        return self.update_network_total(parent, sign * rollup[0], sign * rollup[1])
 
 
 class Referral(NumeratorMixin, MPTTModel, models.Model):
@@ -198,6 +294,11 @@ class Referral(NumeratorMixin, MPTTModel, models.Model):
         verbose_name = _('Referral')
         verbose_name_plural = _('Referral')
         unique_together = ('parent', 'account')
+        indexes = [
+            models.Index(fields=['parent', 'created_at', 'id']),
+        ]
+
+    objects = ReferralManager()
 
     limit = 3
 
@@ -220,6 +321,28 @@ class Referral(NumeratorMixin, MPTTModel, models.Model):
         max_digits=15,
         decimal_places=2,
         verbose_name=_("Balance"))
+    network_total = models.DecimalField(
+        default=0,
+        max_digits=15,
+        decimal_places=2,
+        editable=False,
+        verbose_name=_("Network total"),
+        help_text=_("Paid amount of this referral and all of its downlines"))
+    network_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name=_("Network count"),
+        help_text=_("Paid count of this referral and all of its downlines"))
+    grade = models.ForeignKey(
+        Grade, null=True, blank=True,
+        editable=False,
+        on_delete=models.SET_NULL,
+        related_name='referrals',
+        verbose_name=_("Grade"))
+    graded_at = models.DateTimeField(
+        null=True, blank=True,
+        editable=False,
+        verbose_name=_("Graded at"))
     created_at = models.DateTimeField(
         default=timezone.now, editable=False)
 
@@ -230,12 +353,38 @@ class Referral(NumeratorMixin, MPTTModel, models.Model):
             else self.account.get_full_name()
         )
 
+    def save(self, *args, **kwargs):
+        # MPTT overwrites the cached parent while moving, keep it for node_moved receivers
+        if not getattr(self, 'is_moving', False):
+            self.previous_parent_id = getattr(self, '_mptt_cached_fields', {}).get('parent')
+        super().save(*args, **kwargs)
+
+    def move_to(self, target, position='first-child'):
+        # The manager rewrites parent and cached fields before its own save
+        self.previous_parent_id = self.parent_id
+        self.is_moving = True
+        try:
+            super().move_to(target, position)
+        finally:
+            self.is_moving = False
+
     def update_balance(self, balance):
+        # Only write balance, rollup counters are maintained with F() updates
         self.balance = balance
-        self.save()
+        self.save(update_fields=['balance'])
 
     def get_referral_limit(self):
-        return getattr(settings, 'REFERRAL_DOWNLINE_LIMIT', None) or self.limit
+        return type(self).objects.get_referral_limit()
+
+    def get_pending_balance(self):
+        """ Unsettled commissions, summed over the pending partial index """
+        pending = self.transactions.filter(is_settled=False).aggregate(
+            pending=models.Sum('total'))['pending'] or Decimal('0')
+        # SQLite sums decimals as floats, round back to the field precision
+        return pending.quantize(Decimal('0.01'))
+
+    def get_available_balance(self):
+        return self.balance + self.get_pending_balance()
 
     def get_uplines(self):
         return self.get_ancestors(include_self=False, ascending=True)[:self.get_referral_limit()]
@@ -246,6 +395,13 @@ class Transaction(NumeratorMixin):
         ordering = ['-created_at']
         verbose_name = _('Transaction')
         verbose_name_plural = _('Transactions')
+        indexes = [
+            models.Index(fields=['content_type', 'object_id', 'flow']),
+            models.Index(
+                fields=['referral'],
+                name='django_extr_pending_idx',
+                condition=models.Q(is_settled=False)),
+        ]
 
     id = models.UUIDField(
         default=uuid.uuid4,
@@ -294,6 +450,10 @@ class Transaction(NumeratorMixin):
         null=True, blank=True,
         verbose_name=_('Note'))
     is_verified = models.BooleanField(default=False)
+    is_settled = models.BooleanField(
+        default=True,
+        verbose_name=_('Settled'),
+        help_text=_("Pending commissions are folded into referral balance by settlement"))
     created_at = models.DateTimeField(
         default=timezone.now, editable=False)
     verified_at = models.DateTimeField(
@@ -336,6 +496,158 @@ class Transaction(NumeratorMixin):
         super().save(*args, **kwargs)
 
 
+class TransactionArchiveManager(models.Manager):
+
+    @staticmethod
+    def get_year_range(year):
+        """ Return [start, end) datetime of year """
+        return (
+            timezone.make_aware(timezone.datetime(year, 1, 1)),
+            timezone.make_aware(timezone.datetime(year + 1, 1, 1))
+        )
+
+    def in_year(self, year):
+        """ Range filter, lets PostgreSQL prune to one partition """
+        start, end = self.get_year_range(year)
+        return self.filter(created_at__gte=start, created_at__lt=end)
+
+    def ensure_partition(self, year):
+        """ Create the yearly partition on PostgreSQL, noop elsewhere """
+        connection = connections[self.db]
+        if connection.vendor != 'postgresql':
+            return
+        start, end = self.get_year_range(year)
+        table = self.model._meta.db_table
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "CREATE TABLE IF NOT EXISTS %s PARTITION OF %s FOR VALUES FROM ('%s') TO ('%s')" % (
+                    connection.ops.quote_name('%s_y%s' % (table, year)),
+                    connection.ops.quote_name(table),
+                    start.isoformat(), end.isoformat()))
+
+    def archive(self, before, batch_size=5000):
+        """
+            Move ledger rows created before ``before`` into the archive,
+            one short transaction per batch. Return moved row count.
+        """
+        fields = [field.attname for field in self.model._meta.concrete_fields]
+        for date in Transaction.objects.filter(
+                created_at__lt=before).datetimes('created_at', 'year'):
+            self.ensure_partition(date.year)
+        moved = 0
+        while True:
+            with transaction.atomic(using=self.db):
+                rows = list(Transaction.objects.filter(
+                    created_at__lt=before, is_settled=True
+                ).order_by('created_at').values(*fields)[:batch_size])
+                if not rows:
+                    break
+                self.bulk_create([self.model(**row) for row in rows])
+                Transaction.objects.filter(pk__in=[row['id'] for row in rows]).delete()
+            moved += len(rows)
+        return moved
+
+    def get_signed_totals(self, referral_ids):
+        """ Archived balance movement of each referral """
+        return dict(self.filter(referral_id__in=referral_ids).order_by().values(
+            'referral_id'
+        ).annotate(signed_total=models.Sum(models.Case(
+            models.When(flow='OUT', then=-models.F('total')),
+            default=models.F('total'),
+            output_field=models.DecimalField(max_digits=15, decimal_places=2),
+        ))).values_list('referral_id', 'signed_total'))
+
+
+class TransactionArchive(models.Model):
+    """
+        Closed years of the referral ledger. On PostgreSQL the table is
+        range partitioned by created_at with one partition per year,
+        see migration 0008. Rows are moved here by archive_referral_transactions.
+    """
+    class Meta:
+        managed = False
+        ordering = ['-created_at']
+        verbose_name = _('Archived transaction')
+        verbose_name_plural = _('Archived transactions')
+
+    objects = TransactionArchiveManager()
+
+    id = models.UUIDField(
+        default=uuid.uuid4,
+        editable=False,
+        primary_key=True,
+        verbose_name='uuid')
+    reg_number = models.PositiveIntegerField(
+        null=True, blank=True,
+        editable=False,
+        verbose_name=_('Reg number'))
+    inner_id = models.CharField(
+        max_length=50,
+        null=True, blank=True,
+        editable=False,
+        verbose_name=_('Inner ID'))
+    flow = models.CharField(
+        max_length=3,
+        choices=(('IN', 'In'), ('OUT', 'Out')),
+        default='IN', verbose_name=_('Flow'))
+    referral = models.ForeignKey(
+        Referral, on_delete=models.DO_NOTHING,
+        db_constraint=False, db_index=False,
+        related_name='archived_transactions',
+        verbose_name=_("Referral"))
+    amount = models.DecimalField(
+        default=0,
+        max_digits=15,
+        decimal_places=2,
+        verbose_name=_("Amount"))
+    rate = models.DecimalField(
+        default=0.00,
+        max_digits=5,
+        decimal_places=2,
+        verbose_name=_('Rate'))
+    total = models.DecimalField(
+        default=0,
+        max_digits=15,
+        decimal_places=2,
+        verbose_name=_("Total"))
+    old_balance = models.DecimalField(
+        default=0,
+        max_digits=15,
+        decimal_places=2,
+        verbose_name=_("Old Balance"))
+    balance = models.DecimalField(
+        default=0,
+        max_digits=15,
+        decimal_places=2,
+        verbose_name=_("Balance"))
+    note = models.CharField(
+        max_length=250,
+        null=True, blank=True,
+        verbose_name=_('Note'))
+    is_verified = models.BooleanField(default=False)
+    created_at = models.DateTimeField(
+        default=timezone.now, editable=False)
+    verified_at = models.DateTimeField(
+        null=True, blank=True,
+        editable=False,
+        verbose_name=_("Verified at"))
+
+    content_type = models.ForeignKey(
+        ContentType,
+        models.DO_NOTHING,
+        db_constraint=False, db_index=False,
+        blank=True, null=True,
+        verbose_name=_('reference type'))
+    object_id = models.CharField(
+        _('reference id'),
+        max_length=100,
+        blank=True, null=True)
+    content_object = GenericForeignKey()
+
+    def __str__(self):
+        return self.inner_id
+
+
 class AbstractReceivable(NumeratorMixin, models.Model):
     class Meta:
         abstract = True
@@ -369,4 +681,291 @@ class AbstractPayable(NumeratorMixin, models.Model):
     amount = models.DecimalField(
         max_digits=15, decimal_places=2, default=0)
     is_paid = models.BooleanField(default=False)
-    is_cancelled = models.BooleanField(default=False)
\ No newline at end of file
+    is_cancelled = models.BooleanField(default=False)
+
+
+def get_receivable_models():
+    return [model for model in apps.get_models() if issubclass(model, AbstractReceivable)]
+
+
+class LeaderboardManager(models.Manager):
+
+    @staticmethod
+    def get_period(date=None):
+        """ Leaderboard period of date, formatted as YYYY-MM """
+        return timezone.localtime(date or timezone.now()).strftime('%Y-%m')
+
+    @staticmethod
+    def get_period_range(period):
+        """ Return [start, end) datetime of period """
+        year, month = [int(x) for x in period.split('-')]
+        start = timezone.make_aware(timezone.datetime(year, month, 1))
+        if month == 12:
+            end = timezone.make_aware(timezone.datetime(year + 1, 1, 1))
+        else:
+            end = timezone.make_aware(timezone.datetime(year, month + 1, 1))
+        return start, end
+
+    def add_score(self, referral, amount, date=None):
+        """ Add commission posting amount to referral score of the period """
+        period = self.get_period(date)
+        lookup = {'period': period, 'referral': referral}
+        update = {'score': models.F('score') + amount, 'modified_at': timezone.now()}
+        if self.filter(**lookup).update(**update):
+            return
+        try:
+            with transaction.atomic():
+                self.create(score=amount, **lookup)
+        except IntegrityError:
+            # Created by concurrent posting
+            self.filter(**lookup).update(**update)
+
+    def top(self, period=None, limit=100):
+        """ Top referrals of period, read from the (period, score) index """
+        return self.filter(
+            period=period or self.get_period()
+        ).select_related('referral__account').order_by('-score')[:limit]
+
+    def rank(self, referral, period=None):
+        """ Rank of referral in period, None if referral has no score yet """
+        period = period or self.get_period()
+        score = self.filter(
+            period=period, referral=referral
+        ).values_list('score', flat=True).first()
+        if score is None:
+            return None
+        return self.filter(period=period, score__gt=score).count() + 1
+
+    def rebuild(self, period):
+        """ Recompute period scores from receivable postings in the ledger """
+        start, end = self.get_period_range(period)
+        content_types = ContentType.objects.get_for_models(*get_receivable_models()).values()
+        scores = {}
+        # Period may span live and archived ledger rows
+        for model in (Transaction, TransactionArchive):
+            rows = model.objects.filter(
+                created_at__gte=start,
+                created_at__lt=end,
+                content_type__in=content_types,
+            ).order_by().values('referral').annotate(
+                score=models.Sum(models.Case(
+                    models.When(flow='IN', then=models.F('amount')),
+                    default=models.F('amount') * -1,
+                    output_field=models.DecimalField(max_digits=15, decimal_places=2),
+                ))
+            ).values_list('referral', 'score')
+            for referral_id, score in rows.iterator():
+                scores[referral_id] = scores.get(referral_id, 0) + score
+        with transaction.atomic():
+            self.filter(period=period).delete()
+            entries = self.bulk_create([
+                self.model(period=period, referral_id=referral_id, score=score)
+                for referral_id, score in scores.items()
+            ], batch_size=1000)
+        return len(entries)
+
+
+class Leaderboard(models.Model):
+    class Meta:
+        verbose_name = _('Leaderboard')
+        verbose_name_plural = _('Leaderboards')
+        unique_together = ('period', 'referral')
+        indexes = [
+            models.Index(fields=['period', '-score'])
+        ]
+
+    objects = LeaderboardManager()
+
+    id = models.UUIDField(
+        default=uuid.uuid4,
+        editable=False,
+        primary_key=True,
+        verbose_name='uuid')
+    period = models.CharField(
+        max_length=7,
+        verbose_name=_('Period'))
+    referral = models.ForeignKey(
+        Referral, on_delete=models.CASCADE,
+        related_name='leaderboards',
+        verbose_name=_("Referral"))
+    score = models.DecimalField(
+        default=0,
+        max_digits=15,
+        decimal_places=2,
+        verbose_name=_("Score"))
+    modified_at = models.DateTimeField(
+        default=timezone.now, editable=False)
+
+    def __str__(self):
+        return "%s %s" % (self.period, self.referral)
+
+
+class ReferralLinkStatManager(models.Manager):
+
+    def add_counts(self, counts, field='clicks', batch_size=500):
+        """
+            Add {(referral_id, date): count} to ``field`` of the daily rows.
+            PostgreSQL and SQLite get one INSERT .. ON CONFLICT per batch.
+        """
+        if field not in ('clicks', 'conversions'):
+            raise ValueError('field must be clicks or conversions')
+        counts = [(key, count) for key, count in counts.items() if count]
+        connection = connections[self.db]
+        if connection.vendor not in ('postgresql', 'sqlite'):
+            for (referral_id, date), count in counts:
+                self.add_count(referral_id, date, count, field)
+            return
+        opts = self.model._meta
+        quote = connection.ops.quote_name
+        columns = ['id', 'referral_id', 'date', 'clicks', 'conversions']
+        prepared = [opts.get_field(name) for name in ('id', 'referral', 'date')]
+        sql = (
+            'INSERT INTO {table} ({columns}) VALUES {values} '
+            'ON CONFLICT ({referral}, {date}) DO UPDATE SET {field} = {table}.{field} + EXCLUDED.{field}'
+        )
+        for idx in range(0, len(counts), batch_size):
+            batch = counts[idx:idx + batch_size]
+            params = []
+            for (referral_id, date), count in batch:
+                values = [
+                    field_.get_db_prep_value(value, connection)
+                    for field_, value in zip(prepared, (uuid.uuid4(), referral_id, date))]
+                params += values + ([count, 0] if field == 'clicks' else [0, count])
+            with connection.cursor() as cursor:
+                cursor.execute(sql.format(
+                    table=quote(opts.db_table),
+                    columns=', '.join(quote(name) for name in columns),
+                    values=', '.join(['(%s)' % ', '.join(['%s'] * len(columns))] * len(batch)),
+                    referral=quote('referral_id'),
+                    date=quote('date'),
+                    field=quote(field),
+                ), params)
+
+    def add_count(self, referral_id, date, count=1, field='clicks'):
+        lookup = {'referral_id': referral_id, 'date': date}
+        if self.filter(**lookup).update(**{field: models.F(field) + count}):
+            return
+        try:
+            with transaction.atomic():
+                self.create(**{field: count}, **lookup)
+        except IntegrityError:
+            # Created by concurrent flush
+            self.filter(**lookup).update(**{field: models.F(field) + count})
+
+
+class ReferralLinkStat(models.Model):
+    class Meta:
+        verbose_name = _('Referral link stat')
+        verbose_name_plural = _('Referral link stats')
+        unique_together = ('referral', 'date')
+
+    objects = ReferralLinkStatManager()
+
+    id = models.UUIDField(
+        default=uuid.uuid4,
+        editable=False,
+        primary_key=True,
+        verbose_name='uuid')
+    referral = models.ForeignKey(
+        Referral, on_delete=models.CASCADE,
+        related_name='link_stats',
+        verbose_name=_("Referral"))
+    date = models.DateField(
+        verbose_name=_('Date'))
+    clicks = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_('Clicks'))
+    conversions = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_('Conversions'))
+
+    def __str__(self):
+        return "%s %s" % (self.date, self.referral)
+
+    @property
+    def conversion_rate(self):
+        return (self.conversions * 100 / self.clicks) if self.clicks else 0
+
+
+class DownlineCounterManager(models.Manager):
+
+    def get_subtree_levels(self, referral, limit=None):
+        """
+            Return {relative depth: node count} of referral subtree, itself
+            at 0. Walks the parent column, MPTT fields are already shifted
+            when a deleted node reaches pre_delete.
+        """
+        limit = limit or Referral.objects.get_referral_limit()
+        levels = {0: 1}
+        if limit > 1:
+            for downline in Referral.objects.get_network_queryset([referral], limit - 1, uplines=False):
+                levels[downline.network_depth] = levels.get(downline.network_depth, 0) + 1
+        return levels
+
+    def shift(self, parent_id, levels, sign=1):
+        """
+            Add (or remove with sign=-1) a subtree with relative depth
+            ``levels`` below ``parent_id`` to the counters of the parent
+            and its uplines, up to the referral limit.
+        """
+        if not parent_id or not levels:
+            return
+        limit = Referral.objects.get_referral_limit()
+        uplines = Referral.objects.get_uplines_for([parent_id], limit - 1).get(parent_id, [])
+        self.shift_ancestors([parent_id] + [upline.pk for upline in uplines], levels, sign)
+
+    def shift_ancestors(self, ancestors, levels, sign=1):
+        """ Same as shift with the upline chain given, nearest first """
+        limit = Referral.objects.get_referral_limit()
+        changes = {}
+        for distance, ancestor_id in enumerate(ancestors, 1):
+            for relative, count in levels.items():
+                depth = distance + relative
+                if depth <= limit:
+                    changes[(ancestor_id, depth)] = changes.get((ancestor_id, depth), 0) + sign * count
+        for (referral_id, depth), count in changes.items():
+            self.add_count(referral_id, depth, count)
+
+    def add_count(self, referral_id, depth, count):
+        lookup = {'referral_id': referral_id, 'depth': depth}
+        if self.filter(**lookup).update(count=models.F('count') + count):
+            return
+        try:
+            with transaction.atomic():
+                self.create(count=max(count, 0), **lookup)
+        except IntegrityError:
+            # Created by concurrent signup
+            self.filter(**lookup).update(count=models.F('count') + count)
+
+    def rebuild(self, batch_size=5000, min_tree_id=None):
+        from .rollups import rebuild_downline_counters
+        return rebuild_downline_counters(
+            Referral, self.model, Referral.objects.get_referral_limit(), batch_size, min_tree_id)
+
+
+class DownlineCounter(models.Model):
+    class Meta:
+        ordering = ['depth']
+        verbose_name = _('Downline counter')
+        verbose_name_plural = _('Downline counters')
+        unique_together = ('referral', 'depth')
+
+    objects = DownlineCounterManager()
+
+    id = models.UUIDField(
+        default=uuid.uuid4,
+        editable=False,
+        primary_key=True,
+        verbose_name='uuid')
+    referral = models.ForeignKey(
+        Referral, on_delete=models.CASCADE,
+        related_name='downline_counters',
+        verbose_name=_("Referral"))
+    depth = models.PositiveSmallIntegerField(
+        verbose_name=_('Depth'))
+    count = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_('Count'))
+
+    def __str__(self):
+        return "%s %s" % (self.referral, self.depth)
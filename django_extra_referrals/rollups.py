@@ -0,0 +1,45 @@
+"""
+    Rebuild queries for denormalized referral counters. Models are passed
+    in so data migrations can run them against historical models.
+"""
+from django.db import transaction
+
+
+def rebuild_downline_counters(referral_model, counter_model, limit, batch_size=5000, min_tree_id=None):
+    """
+        Recount every referral in one preorder pass over the tree,
+        counters of a referral are written once its subtree is closed.
+        With ``min_tree_id`` only trees from that id on are recounted.
+    """
+    counters = counter_model._base_manager
+    referrals = referral_model._base_manager.all()
+    if min_tree_id is not None:
+        counters = counters.filter(referral__tree_id__gte=min_tree_id)
+        referrals = referrals.filter(tree_id__gte=min_tree_id)
+    rows = referrals.order_by('tree_id', 'lft').values_list(
+        'pk', 'tree_id', 'lft', 'rght').iterator(chunk_size=batch_size)
+    stack = []  # [pk, tree_id, rght, {depth: count}] of open referrals
+    batch = []
+    created = 0
+
+    def close(node):
+        batch.extend(
+            counter_model(referral_id=node[0], depth=depth, count=count)
+            for depth, count in sorted(node[3].items()))
+
+    with transaction.atomic():
+        counters.all().delete()
+        for pk, tree_id, lft, rght in rows:
+            while stack and (stack[-1][1] != tree_id or stack[-1][2] < lft):
+                close(stack.pop())
+            for depth in range(1, min(limit, len(stack)) + 1):
+                counts = stack[-depth][3]
+                counts[depth] = counts.get(depth, 0) + 1
+            stack.append([pk, tree_id, rght, {}])
+            if len(batch) >= batch_size:
+                created += len(counters.bulk_create(batch))
+                batch = []
+        while stack:
+            close(stack.pop())
+        created += len(counters.bulk_create(batch, batch_size=batch_size))
+    return created
@@ -0,0 +1,75 @@
+from django.db import models
+from django.db.models.signals import post_save, pre_delete, post_delete
+from django.dispatch import receiver
+
+from mptt.signals import node_moved
+
+from .models import Referral, DownlineCounter
+
+
+@receiver(post_save, sender=Referral)
+def add_signup_downline_counters(sender, instance, created, raw=False, **kwargs):
+    if created and not raw and instance.parent_id:
+        DownlineCounter.objects.shift(instance.parent_id, {0: 1})
+
+
+@receiver(node_moved, sender=Referral)
+def move_downline_counters(sender, instance, **kwargs):
+    """ Tree fields and parent column are already moved here """
+    old_parent_id = getattr(instance, 'previous_parent_id', None)
+    if old_parent_id == instance.parent_id:
+        return
+    levels = DownlineCounter.objects.get_subtree_levels(instance)
+    DownlineCounter.objects.shift(old_parent_id, levels, -1)
+    DownlineCounter.objects.shift(instance.parent_id, levels)
+
+
+@receiver(node_moved, sender=Referral)
+def move_network_rollups(sender, instance, **kwargs):
+    """ The subtree paid totals leave the old uplines and join the new ones """
+    old_parent_id = getattr(instance, 'previous_parent_id', None)
+    if old_parent_id == instance.parent_id:
+        return
+    Referral.objects.shift_network_total(old_parent_id, instance.pk, -1)
+    Referral.objects.shift_network_total(instance.parent_id, instance.pk)
+
+
+@receiver(pre_delete, sender=Referral)
+def keep_deleted_referral_network(sender, instance, **kwargs):
+    """ Upline chain, subtree levels and rollup of the row while the tree is intact """
+    row = Referral.objects.filter(pk=instance.pk).values_list(
+        'level', 'network_total', 'network_count').first()
+    if row is None:
+        return
+    level, network_total, network_count = row
+    uplines = Referral.objects.get_uplines_for([instance.pk], level).get(instance.pk, []) if level else []
+    instance.deleted_uplines = [upline.pk for upline in uplines]
+    instance.deleted_levels = DownlineCounter.objects.get_subtree_levels(instance)
+    instance.deleted_rollup = (network_total, network_count)
+
+
+@receiver(post_delete, sender=Referral)
+def remove_deleted_referral_network(sender, instance, **kwargs):
+    """
+        Rows deleted together all reach pre_delete before any is removed,
+        and all are gone by post_delete. A deleted upline takes its whole
+        subtree off the uplines above it, so only the uplines below the
+        nearest deleted one are updated here.
+    """
+    uplines = getattr(instance, 'deleted_uplines', None)
+    if not uplines:
+        return
+    existing = set(Referral.objects.filter(pk__in=uplines).values_list('pk', flat=True))
+    remaining = []
+    for upline_id in uplines:
+        if upline_id not in existing:
+            break
+        remaining.append(upline_id)
+    if not remaining:
+        return
+    DownlineCounter.objects.shift_ancestors(remaining, instance.deleted_levels, -1)
+    network_total, network_count = instance.deleted_rollup
+    if network_total or network_count:
+        Referral.objects.filter(pk__in=remaining).update(
+            network_total=models.F('network_total') - network_total,
+            network_count=models.F('network_count') - network_count)
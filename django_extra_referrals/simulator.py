@@ -0,0 +1,90 @@
+import numpy as np
+
+from django_extra_referrals.models import Referral, get_receivable_models
+
+
+class CommissionSimulator:
+    """
+        Replay paid receivables under candidate flat rates. Referral
+        structure and receivables are loaded once into arrays, payouts
+        of every rate vector are computed with one matrix product and
+        nothing is written to the ledger.
+    """
+    chunk_size = 20000
+
+    def __init__(self, querysets=None, depth=None):
+        self.depth = depth or Referral.objects.get_referral_limit()
+        if querysets is None:
+            querysets = [model.objects.filter(is_paid=True) for model in get_receivable_models()]
+        self.load_referrals()
+        self.load_receivables(querysets)
+
+    def load_referrals(self):
+        rows = Referral.objects.order_by().values_list('pk', 'parent_id').iterator(
+            chunk_size=self.chunk_size)
+        pks, parent_ids = [], []
+        for pk, parent_id in rows:
+            pks.append(pk)
+            parent_ids.append(parent_id)
+        self.index = {pk: idx for idx, pk in enumerate(pks)}
+        self.referral_ids = pks
+        parents = np.fromiter(
+            (self.index.get(parent_id, -1) for parent_id in parent_ids),
+            dtype=np.int64, count=len(parent_ids))
+
+        # ancestors[i, k] is the index of upline k + 1 of referral i, -1 when none
+        self.ancestors = np.full((len(pks), self.depth), -1, dtype=np.int64)
+        if self.depth and len(pks):
+            self.ancestors[:, 0] = parents
+            for level in range(1, self.depth):
+                previous = self.ancestors[:, level - 1]
+                self.ancestors[:, level] = np.where(previous >= 0, parents[previous], -1)
+
+    def load_receivables(self, querysets):
+        referrals, campaigners, amounts = [], [], []
+        for queryset in querysets:
+            rows = queryset.order_by().values_list(
+                'referral_id', 'campaigner_id', 'amount'
+            ).iterator(chunk_size=self.chunk_size)
+            for referral_id, campaigner_id, amount in rows:
+                referrals.append(self.index.get(referral_id, -1))
+                campaigners.append(self.index.get(campaigner_id, -1))
+                amounts.append(amount)
+        referrals = np.array(referrals, dtype=np.int64)
+        campaigners = np.array(campaigners, dtype=np.int64)
+        amounts = np.array(amounts, dtype=np.float64)
+        size = len(self.referral_ids)
+
+        # volumes[k, i] is the amount referral i earns a level k + 1 commission on
+        self.volumes = np.zeros((self.depth, size))
+        referred = referrals >= 0
+        for level in range(self.depth):
+            uplines = self.ancestors[referrals[referred], level]
+            mask = uplines >= 0
+            self.volumes[level] = np.bincount(
+                uplines[mask], weights=amounts[referred][mask], minlength=size)
+
+        # Campaign rate is only paid when receivable has no referral
+        campaign = ~referred & (campaigners >= 0)
+        self.campaign_volume = np.bincount(
+            campaigners[campaign], weights=amounts[campaign], minlength=size)
+        self.receivable_count = len(amounts)
+        self.receivable_total = amounts.sum()
+
+    def get_rate_matrix(self, uplines_rates):
+        rates = np.zeros((len(uplines_rates), self.depth))
+        for idx, vector in enumerate(uplines_rates):
+            vector = list(vector)[:self.depth]
+            rates[idx, :len(vector)] = vector
+        return rates
+
+    def simulate(self, uplines_rates, campaign_rates):
+        """
+            Return payouts shaped (scenarios, referrals) for each
+            upline rate vector and its campaign rate
+        """
+        rates = self.get_rate_matrix(uplines_rates)
+        campaign_rates = np.broadcast_to(
+            np.asarray(campaign_rates, dtype=np.float64), (len(rates),))
+        payouts = rates @ self.volumes + campaign_rates[:, None] * self.campaign_volume
+        return payouts / 100
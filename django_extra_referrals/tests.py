@@ -0,0 +1,74 @@
+import io
+import os
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from .models import Referral, DownlineCounter
+
+
+class DeleteReferralsTest(TestCase):
+    """ Counters and rollups of uplines left after deleting a→b→c→d→e rows """
+
+    def setUp(self):
+        User = get_user_model()
+        self.chain = []
+        for name in 'abcde':
+            account = User.objects.create(username=name)
+            parent = self.chain[-1] if self.chain else None
+            self.chain.append(Referral.objects.create(account=account, parent=parent))
+        for referral in self.chain[1:]:
+            Referral.objects.update_network_total(Referral.objects.get(pk=referral.pk), 1000, 1)
+
+    def get_counters(self, referral):
+        return dict(DownlineCounter.objects.filter(
+            referral=referral, count__gt=0).values_list('depth', 'count'))
+
+    def get_rollup(self, referral):
+        return Referral.objects.filter(pk=referral.pk).values_list(
+            'network_total', 'network_count').get()
+
+    def test_delete_upline_with_downline(self):
+        a, b, c, d, e = self.chain
+        Referral.objects.filter(pk__in=[b.pk, c.pk]).delete()
+        self.assertEqual(self.get_counters(a), {})
+        self.assertEqual(self.get_rollup(a), (0, 0))
+        self.assertEqual(self.get_counters(d), {1: 1})
+        self.assertEqual(self.get_rollup(d), (2000, 2))
+
+    def test_delete_accounts_of_one_chain(self):
+        a, b, c, d, e = self.chain
+        get_user_model().objects.filter(pk__in=[b.account_id, d.account_id]).delete()
+        self.assertEqual(self.get_counters(a), {})
+        self.assertEqual(self.get_rollup(a), (0, 0))
+        self.assertEqual(self.get_counters(c), {})
+        self.assertEqual(self.get_rollup(c), (1000, 1))
+        self.assertEqual(self.get_counters(e), {})
+        self.assertEqual(self.get_rollup(e), (1000, 1))
+
+
+class ImportReferralsTest(TestCase):
+    """ Imported trees get downline counters, existing trees keep theirs """
+
+    def test_import_rebuilds_counters_of_imported_trees(self):
+        User = get_user_model()
+        root = Referral.objects.create(account=User.objects.create(username='root'))
+        child = Referral.objects.create(account=User.objects.create(username='child'), parent=root)
+        Referral.objects.create(account=User.objects.create(username='grandchild'), parent=child)
+        expected = sorted(DownlineCounter.objects.filter(
+            count__gt=0).values_list('referral_id', 'depth', 'count'))
+        fd, path = tempfile.mkstemp()
+        os.close(fd)
+        self.addCleanup(os.remove, path)
+        call_command('export_referrals', path, stdout=io.StringIO())
+        Referral.objects.all().delete()
+        other = Referral.objects.create(account=User.objects.create(username='other'))
+        Referral.objects.create(account=User.objects.create(username='other-child'), parent=other)
+
+        call_command('import_referrals', path, stdout=io.StringIO())
+        imported = DownlineCounter.objects.filter(count__gt=0).exclude(referral=other)
+        self.assertEqual(sorted(imported.values_list('referral_id', 'depth', 'count')), expected)
+        self.assertEqual(list(DownlineCounter.objects.filter(
+            referral=other, count__gt=0).values_list('depth', 'count')), [(1, 1)])
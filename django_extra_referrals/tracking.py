@@ -0,0 +1,68 @@
+import atexit
+import threading
+import time
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import Referral, ReferralLinkStat
+
+REFERRAL_CLICK_FLUSH_INTERVAL = getattr(settings, 'REFERRAL_CLICK_FLUSH_INTERVAL', 60)
+REFERRAL_CLICK_FLUSH_SIZE = getattr(settings, 'REFERRAL_CLICK_FLUSH_SIZE', 1000)
+
+
+class ClickBuffer:
+    """
+        Per process referral link click counter keyed by (inner_id, date).
+        Counts are written to ReferralLinkStat when the buffer is older
+        than REFERRAL_CLICK_FLUSH_INTERVAL seconds or holds
+        REFERRAL_CLICK_FLUSH_SIZE clicks, and when the process exits.
+    """
+
+    def __init__(self, interval=REFERRAL_CLICK_FLUSH_INTERVAL, size=REFERRAL_CLICK_FLUSH_SIZE):
+        self.interval = interval
+        self.size = size
+        self.lock = threading.Lock()
+        self.counts = {}
+        self.clicks = 0
+        self.flushed_at = time.monotonic()
+
+    def add(self, inner_id, date=None):
+        key = (inner_id, date or timezone.localdate())
+        with self.lock:
+            self.counts[key] = self.counts.get(key, 0) + 1
+            self.clicks += 1
+
+    def should_flush(self):
+        return self.clicks >= self.size or (
+            self.clicks and time.monotonic() - self.flushed_at >= self.interval)
+
+    def flush(self):
+        with self.lock:
+            counts, self.counts = self.counts, {}
+            self.clicks = 0
+            self.flushed_at = time.monotonic()
+        if not counts:
+            return 0
+        try:
+            referral_ids = dict(Referral.objects.filter(
+                inner_id__in={inner_id for inner_id, _ in counts}
+            ).values_list('inner_id', 'pk'))
+            stats = {}
+            for (inner_id, date), count in counts.items():
+                if inner_id in referral_ids:
+                    key = (referral_ids[inner_id], date)
+                    stats[key] = stats.get(key, 0) + count
+            ReferralLinkStat.objects.add_counts(stats, 'clicks')
+        except Exception:
+            # Keep clicks for the next flush
+            with self.lock:
+                for key, count in counts.items():
+                    self.counts[key] = self.counts.get(key, 0) + count
+                    self.clicks += count
+            raise
+        return sum(stats.values())
+
+
+click_buffer = ClickBuffer()
+atexit.register(click_buffer.flush)
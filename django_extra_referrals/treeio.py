@@ -0,0 +1,141 @@
+"""
+    Compact binary dump of the referral tree. A dump is the MAGIC header
+    followed by fixed width RECORD_DTYPE records in tree preorder, each
+    record points to its parent by record index (-1 for roots). Accounts
+    are referenced by their integer primary key and must exist on import.
+"""
+import uuid
+import datetime
+from decimal import Decimal
+
+import numpy as np
+
+MAGIC = b'REFTREE1'
+EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+MICROSECOND = datetime.timedelta(microseconds=1)
+
+RECORD_DTYPE = np.dtype([
+    ('id', 'V16'),
+    ('parent', '<i8'),
+    ('account', '<i8'),
+    ('inner_id', 'S32'),
+    ('reg_number', '<u4'),
+    ('created_at', '<i8'),
+    ('balance', '<i8'),
+    ('network_total', '<i8'),
+    ('network_count', '<u4'),
+    ('descendants', '<u4'),
+])
+
+EXPORT_FIELDS = [
+    'id', 'parent_id', 'account_id', 'inner_id', 'reg_number', 'created_at',
+    'balance', 'network_total', 'network_count', 'lft', 'rght'
+]
+
+
+def to_cents(value):
+    return int((value or 0) * 100)
+
+
+def from_cents(value):
+    return Decimal(int(value)).scaleb(-2)
+
+
+def to_micro(value):
+    return (value - EPOCH) // MICROSECOND
+
+
+def from_micro(value):
+    return EPOCH + datetime.timedelta(microseconds=int(value))
+
+
+def write_tree(stream, rows, chunk_size=10000):
+    """
+        Write ``rows`` (EXPORT_FIELDS tuples ordered by tree_id, lft) to a
+        binary stream. Memory is bounded by chunk size and tree depth.
+    """
+    stream.write(MAGIC)
+    ancestors = []  # (rght, record index) of open nodes
+    chunk = []
+    count = 0
+    for pk, parent_id, account_id, inner_id, reg_number, created_at, \
+            balance, network_total, network_count, lft, rght in rows:
+        if parent_id is None:
+            ancestors = []
+        while ancestors and ancestors[-1][0] < lft:
+            ancestors.pop()
+        parent = ancestors[-1][1] if ancestors else -1
+        ancestors.append((rght, count))
+        chunk.append((
+            pk.bytes, parent, account_id, (inner_id or '').encode(),
+            reg_number or 0, to_micro(created_at), to_cents(balance),
+            to_cents(network_total), network_count, (rght - lft - 1) // 2
+        ))
+        count += 1
+        if len(chunk) >= chunk_size:
+            stream.write(np.array(chunk, dtype=RECORD_DTYPE).tobytes())
+            chunk = []
+    if chunk:
+        stream.write(np.array(chunk, dtype=RECORD_DTYPE).tobytes())
+    return count
+
+
+def read_records(stream, chunk_size=10000):
+    """ Yield RECORD_DTYPE arrays of at most chunk_size records """
+    if stream.read(len(MAGIC)) != MAGIC:
+        raise ValueError("Not a referral tree dump")
+    size = RECORD_DTYPE.itemsize
+    while True:
+        data = stream.read(size * chunk_size)
+        if not data:
+            break
+        if len(data) % size:
+            raise ValueError("Truncated referral tree dump")
+        yield np.frombuffer(data, dtype=RECORD_DTYPE)
+
+
+def read_tree(stream, tree_id_offset=0, chunk_size=10000):
+    """
+        Yield Referral field values per record with MPTT fields
+        computed in one pass from the exported descendant counts.
+    """
+    ancestors = []  # (record index, rght, uuid) of open nodes
+    position = 0
+    tree_id = tree_id_offset
+    index = 0
+    for records in read_records(stream, chunk_size):
+        for pk, parent, account, inner_id, reg_number, created_at, \
+                balance, network_total, network_count, descendants in records.tolist():
+            pk = uuid.UUID(bytes=pk)
+            if parent < 0:
+                ancestors = []
+                position = 0
+                tree_id += 1
+            else:
+                while ancestors and ancestors[-1][0] != parent:
+                    closed = ancestors.pop()
+                    if position + 1 != closed[1]:
+                        raise ValueError("Inconsistent subtree at record %s" % closed[0])
+                    position = closed[1]
+                if not ancestors:
+                    raise ValueError("Record %s parent is not an open ancestor" % index)
+            lft = position + 1
+            rght = lft + 2 * descendants + 1
+            yield {
+                'id': pk,
+                'parent_id': ancestors[-1][2] if ancestors else None,
+                'account_id': account,
+                'inner_id': inner_id.decode() or None,
+                'reg_number': reg_number or None,
+                'created_at': from_micro(created_at),
+                'balance': from_cents(balance),
+                'network_total': from_cents(network_total),
+                'network_count': network_count,
+                'tree_id': tree_id,
+                'lft': lft,
+                'rght': rght,
+                'level': len(ancestors),
+            }
+            ancestors.append((index, rght, pk))
+            position = lft
+            index += 1
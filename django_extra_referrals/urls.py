@@ -0,0 +1,10 @@
+from django.urls import path
+
+from . import views
+
+app_name = 'django_extra_referrals'
+
+urlpatterns = [
+    path('referral/<uuid:pk>/children/', views.referral_children, name='referral_children'),
+    path('referral/<uuid:pk>/downlines/', views.referral_downline_counts, name='referral_downline_counts'),
+]
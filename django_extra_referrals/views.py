@@ -0,0 +1,78 @@
+import uuid
+
+from django.http import JsonResponse, HttpResponseBadRequest
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+from .models import Referral, DownlineCounter
+
+REFERRAL_CHILDREN_PAGE_SIZE = 50
+REFERRAL_CHILDREN_MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(referral):
+    return '%s_%s' % (referral.created_at.isoformat(), referral.pk)
+
+
+def decode_cursor(cursor):
+    created_at, _, pk = cursor.rpartition('_')
+    created_at = parse_datetime(created_at)
+    if created_at is None or not pk:
+        raise ValueError("Invalid cursor %s" % cursor)
+    return created_at, pk
+
+
+def referral_children(request, pk):
+    """
+        One level of downlines ordered by (created_at, id), paginated
+        with an opaque ``after`` cursor. Descendant counts come from the
+        node lft/rght so every expansion is a single indexed query.
+    """
+    try:
+        limit = min(int(request.GET.get('limit', REFERRAL_CHILDREN_PAGE_SIZE)),
+                    REFERRAL_CHILDREN_MAX_PAGE_SIZE)
+        limit = max(limit, 1)
+    except ValueError:
+        return HttpResponseBadRequest("Invalid limit")
+    queryset = Referral.objects.filter(parent_id=pk).select_related('account').only(
+        'id', 'inner_id', 'level', 'lft', 'rght', 'tree_id', 'created_at',
+        'network_total', 'account__username', 'account__first_name', 'account__last_name'
+    ).order_by('created_at', 'id')
+    after = request.GET.get('after')
+    if after:
+        try:
+            created_at, after_pk = decode_cursor(after)
+            after_pk = uuid.UUID(after_pk)
+        except ValueError as err:
+            return HttpResponseBadRequest(str(err))
+        queryset = queryset.filter(
+            Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=after_pk))
+
+    referrals = list(queryset[:limit + 1])
+    has_next = len(referrals) > limit
+    referrals = referrals[:limit]
+    results = []
+    for referral in referrals:
+        descendants = referral.get_descendant_count()
+        results.append({
+            'id': str(referral.pk),
+            'inner_id': referral.inner_id,
+            'name': str(referral),
+            'level': referral.level,
+            'descendants': descendants,
+            'has_children': descendants > 0,
+            'network_total': referral.network_total,
+            'created_at': referral.created_at,
+        })
+    return JsonResponse({
+        'results': results,
+        'next': encode_cursor(referrals[-1]) if has_next else None,
+    })
+
+
+def referral_downline_counts(request, pk):
+    """ Precomputed downline count of each level below the referral """
+    counters = DownlineCounter.objects.filter(referral_id=pk).values_list('depth', 'count')
+    return JsonResponse({
+        'results': [{'depth': depth, 'count': count} for depth, count in counters],
+    })
@@ -7,13 +7,19 @@ from polymorphic.admin import PolymorphicParentModelAdmin, PolymorphicChildModel
 from mptt.admin import MPTTModelAdmin
 
 from .models import (
-    Fundraiser, FundraiserTransaction
+    Fundraiser, FundraiserTransaction, Campaign
 )
 
 
 @admin.register(Fundraiser)
 class FundraiserAdmin(admin.ModelAdmin):
-    list_display = ['inner_id', 'name', 'founder', 'balance']
+    list_display = ['inner_id', 'name', 'founder', 'balance', 'total_raised', 'donation_count', 'total_withdrawn', 'follower_count', 'member_count']
+
+
+@admin.register(Campaign)
+class CampaignAdmin(admin.ModelAdmin):
+    list_select_related = ['fundraiser']
+    list_display = ['inner_id', 'title', 'fundraiser', 'target_donation', 'total_raised', 'donation_count', 'progress']
 
 
 @admin.register(FundraiserTransaction)
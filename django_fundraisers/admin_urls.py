@@ -0,0 +1,11 @@
+from django.urls import path
+
+from . import views
+
+app_name = 'django_fundraisers_admin'
+
+urlpatterns = [
+    path('fundraiser/<uuid:pk>/balance-history/', views.fundraiser_balance_history, name='fundraiser_balance_history'),
+    path('fundraiser/<uuid:pk>/statement.csv', views.fundraiser_statement, {'format': 'csv'}, name='fundraiser_statement_csv'),
+    path('fundraiser/<uuid:pk>/statement.jsonl', views.fundraiser_statement, {'format': 'jsonl'}, name='fundraiser_statement_jsonl'),
+]
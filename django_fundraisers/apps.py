@@ -5,3 +5,6 @@ class DjangoFundraisersConfig(AppConfig):
     name = 'django_fundraisers'
     label = 'django_fundraisers'
     verbose_name = 'Fundraisers'
+
+    def ready(self):
+        from . import signals  # noqa: connect listing cache signals
@@ -1,8 +1,9 @@
 from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction as db_transaction
 from django.utils import timezone, translation
 
-from .models import FundraiserTransaction
+from .models import Fundraiser, FundraiserTransaction
 
 FUNDRAISER_SCHEMA = getattr(settings, 'FUNDRAISER_SCHEMA', 'FLAT')
 FUNDRAISER_FLAT_RATE = getattr(settings, 'FUNDRAISER_FLAT_RATE', 70)
@@ -36,22 +37,36 @@ class FundingSchema:
     def get_donation_share_rates(self):
         raise NotImplementedError
 
+    def lock_fundraiser(self):
+        """ Lock fundraiser row and load its current balance """
+        self.fundraiser.balance = Fundraiser._base_manager.select_for_update().filter(
+            pk=self.fundraiser.pk
+        ).values_list('balance', flat=True).get()
+        return self.fundraiser
+
     def post_fundraiser_transaction(self, rate, flow):
-        transaction = FundraiserTransaction(
-            flow=flow,
-            content_object=self.instance,
-            rate=rate,
-            amount=self.instance.amount,
-            fundraiser=self.fundraiser,
-            is_verified=True,
-            verified_at=timezone.now(),
-            note='%s %s' % (
-                self.opts.model_name.title(),
-                self.instance.inner_id
+        with db_transaction.atomic():
+            self.lock_fundraiser()
+            transaction = FundraiserTransaction(
+                flow=flow,
+                content_object=self.instance,
+                rate=rate,
+                amount=self.instance.amount,
+                fundraiser=self.fundraiser,
+                is_verified=True,
+                verified_at=timezone.now(),
+                note='%s %s' % (
+                    self.opts.model_name.title(),
+                    self.instance.inner_id
+                )
             )
-        )
-        transaction.save()
-        self.fundraiser.update_balance(transaction.balance)
+            transaction.total = transaction.get_total()
+            if flow == 'OUT' and transaction.total > self.fundraiser.balance:
+                raise ValueError("%s amount too large, %s balance is %s" % (
+                    self.opts.model_name, self.fundraiser.name, self.fundraiser.balance
+                ))
+            transaction.save()
+            self.fundraiser.update_balance(transaction.balance)
         return transaction
 
 
@@ -72,10 +87,7 @@ class FlatFundingSchema(FundingSchema):
         self.post_fundraiser_transaction(self.share_rate, 'IN')
 
     def send_fundraiser_balance(self):
-        if self.amount > self.fundraiser.balance:
-            raise ValueError("%s amount too large, %s balance is %s" % (
-                self.opts.model_name, self.fundraiser.name, self.fundraiser.balance
-            ))
+        # Balance is checked against the locked row
         self.post_fundraiser_transaction(self.withdraw_rate, 'OUT')
 
     def cancel_transaction(self, flow):
@@ -86,12 +98,10 @@ class FlatFundingSchema(FundingSchema):
         transactions = self.transaction_class.objects.filter(
             object_id=self.instance.id, flow=flow
         )
-        for trx in transactions:
-            if reverse_flow[flow] == 'OUT' and trx.total > trx.fundraiser.balance:
-                raise ValueError("%s amount too large, %s balance is %s" % (
-                    self.opts.model_name, str(trx.fundraiser.account), trx.fundraiser.balance
-                ))
-            self.post_fundraiser_transaction(trx.rate, reverse_flow[flow])
+        # Balance is checked against the locked row when posting the reversal
+        with db_transaction.atomic():
+            for trx in transactions:
+                self.post_fundraiser_transaction(trx.rate, reverse_flow[flow])
 
 
 def get_funding_schema_class():
@@ -0,0 +1,112 @@
+import hashlib
+import time
+import uuid
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+FUNDRAISER_LISTING_PAGE_SIZE = getattr(settings, 'FUNDRAISER_LISTING_PAGE_SIZE', 24)
+FUNDRAISER_LISTING_MAX_PAGE_SIZE = getattr(settings, 'FUNDRAISER_LISTING_MAX_PAGE_SIZE', 100)
+FUNDRAISER_LISTING_CACHE_TIMEOUT = getattr(settings, 'FUNDRAISER_LISTING_CACHE_TIMEOUT', 60 * 60)
+
+
+def get_version_key(model):
+    return 'django_fundraisers:listing:%s' % model._meta.model_name
+
+
+def get_listing_version(model):
+    """
+        Return (version, modified timestamp) of a model listing. Both live
+        in the default cache, workers only agree on them when CACHES points
+        to a shared backend such as the database cache.
+    """
+    key = get_version_key(model)
+    values = cache.get_many([key, key + ':modified'])
+    if key not in values:
+        cache.add(key, 1, None)
+        cache.add(key + ':modified', time.time(), None)
+        values = cache.get_many([key, key + ':modified'])
+    return values.get(key, 1), values.get(key + ':modified', time.time())
+
+
+def bump_listing_version(model):
+    """ Invalidate every cached page of a model listing at once """
+    key = get_version_key(model)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, None)
+    cache.set(key + ':modified', time.time(), None)
+
+
+def invalidate_listings(model):
+    """
+        Bump the model listing once the transaction commits, so a page
+        cached meanwhile can not hold uncommitted rows under the new
+        version. Fundraiser changes also show on campaign cards.
+    """
+    def bump():
+        bump_listing_version(model)
+        if model._meta.model_name == 'fundraiser':
+            bump_listing_version(apps.get_model('django_fundraisers', 'Campaign'))
+    transaction.on_commit(bump)
+
+
+def encode_cursor(obj):
+    return '%s_%s' % (obj.created_at.isoformat(), obj.pk)
+
+
+def decode_cursor(cursor):
+    created_at, _, pk = cursor.rpartition('_')
+    created_at = parse_datetime(created_at)
+    if created_at is None or not pk:
+        raise ValueError("Invalid cursor %s" % cursor)
+    try:
+        pk = uuid.UUID(pk)
+    except ValueError:
+        raise ValueError("Invalid cursor %s" % cursor)
+    return created_at, pk
+
+
+def get_page_params(request):
+    """ Return (cursor, limit) from the query string, raise ValueError when invalid """
+    limit = min(int(request.GET.get('limit', FUNDRAISER_LISTING_PAGE_SIZE)),
+                FUNDRAISER_LISTING_MAX_PAGE_SIZE)
+    if limit < 1:
+        raise ValueError("Invalid limit")
+    cursor = request.GET.get('after') or None
+    if cursor:
+        decode_cursor(cursor)
+    return cursor, limit
+
+
+def get_page(queryset, cursor, limit):
+    """
+        Newest first keyset page over (created_at, id), the cursor
+        continues from the last row so every page is one indexed range scan.
+    """
+    queryset = queryset.order_by('-created_at', '-id')
+    if cursor:
+        created_at, pk = decode_cursor(cursor)
+        queryset = queryset.filter(
+            Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk))
+    objects = list(queryset[:limit + 1])
+    has_next = len(objects) > limit
+    objects = objects[:limit]
+    return objects, encode_cursor(objects[-1]) if has_next else None
+
+
+def get_cache_key(model, kind, cursor, limit):
+    version, _ = get_listing_version(model)
+    digest = hashlib.md5(('%s:%s' % (cursor, limit)).encode()).hexdigest()
+    return 'django_fundraisers:listing:%s:%s:%s:%s' % (model._meta.model_name, version, kind, digest)
+
+
+def get_etag(model, kind, cursor, limit):
+    version, _ = get_listing_version(model)
+    return hashlib.md5(('%s:%s:%s:%s:%s' % (
+        model._meta.model_name, version, kind, cursor, limit)).encode()).hexdigest()
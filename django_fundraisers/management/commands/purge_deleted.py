@@ -0,0 +1,50 @@
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import ProtectedError
+from django.utils import timezone
+
+from django_fundraisers.models import Fundraiser, Membership
+
+
+class Command(BaseCommand):
+    help = "Hard delete fundraisers and memberships soft deleted long ago"
+
+    purge_models = {
+        'membership': Membership,
+        'fundraiser': Fundraiser,
+    }
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=90,
+            help="Purge rows soft deleted more than this many days ago")
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help="Number of rows deleted per transaction")
+        parser.add_argument(
+            '--model', action='append', choices=list(self.purge_models),
+            help="Model to purge, memberships go first by default")
+
+    def purge(self, model, before, batch_size):
+        queryset = model.all_objects.purgeable(before).order_by('deleted_at', 'pk')
+        purged = 0
+        while True:
+            with transaction.atomic():
+                pks = list(queryset.values_list('pk', flat=True)[:batch_size])
+                if not pks:
+                    return purged
+                try:
+                    # Collector delete, cascades and signals still apply
+                    model.all_objects.filter(pk__in=pks).delete()
+                except ProtectedError as err:
+                    raise CommandError("%s: %s" % (model._meta.verbose_name, err))
+            purged += len(pks)
+
+    def handle(self, *args, **options):
+        before = timezone.now() - datetime.timedelta(days=options['days'])
+        batch_size = max(options['batch_size'], 1)
+        for name in options['model'] or list(self.purge_models):
+            purged = self.purge(self.purge_models[name], before, batch_size)
+            self.stdout.write(self.style.SUCCESS("%s %s rows purged" % (purged, name)))
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from django_fundraisers.models import Fundraiser, Membership
+from django_fundraisers.rollups import rebuild_membership_counters
+
+
+class Command(BaseCommand):
+    help = "Rebuild fundraiser follower and member counters from memberships"
+
+    def handle(self, *args, **options):
+        updated = rebuild_membership_counters(Fundraiser, Membership)
+        self.stdout.write(self.style.SUCCESS("%s fundraisers rebuilt" % updated))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from django_fundraisers.search import registry, rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild campaign and fundraiser search documents"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help="Number of documents inserted per query")
+
+    def handle(self, *args, **options):
+        for model in registry:
+            indexed = rebuild_index(model, max(options['batch_size'], 1))
+            self.stdout.write(self.style.SUCCESS(
+                "%s %s documents indexed" % (indexed, model._meta.model_name)))
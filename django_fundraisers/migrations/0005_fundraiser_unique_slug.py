@@ -0,0 +1,17 @@
+# Generated by Django 3.0.14 on 2026-10-19 15:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_fundraisers', '0004_auto_20200409_2003'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='fundraiser',
+            constraint=models.UniqueConstraint(condition=models.Q(is_deleted=False), fields=('slug',), name='unique_active_fundraiser_slug'),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 3.0.14 on 2026-10-19 15:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_fundraisers', '0005_fundraiser_unique_slug'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='campaign',
+            name='donation_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Donation count'),
+        ),
+        migrations.AddField(
+            model_name='campaign',
+            name='last_donation_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Last donation at'),
+        ),
+        migrations.AddField(
+            model_name='campaign',
+            name='total_raised',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=15, verbose_name='Total raised'),
+        ),
+        migrations.AddField(
+            model_name='fundraiser',
+            name='donation_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Donation count'),
+        ),
+        migrations.AddField(
+            model_name='fundraiser',
+            name='last_donation_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Last donation at'),
+        ),
+        migrations.AddField(
+            model_name='fundraiser',
+            name='total_raised',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=15, verbose_name='Total raised'),
+        ),
+        migrations.AddField(
+            model_name='fundraiser',
+            name='total_withdrawn',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=15, verbose_name='Total withdrawn'),
+        ),
+    ]
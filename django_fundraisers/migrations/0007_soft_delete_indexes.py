@@ -0,0 +1,37 @@
+# Generated by Django 3.0.14 on 2026-10-19 15:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_fundraisers', '0006_fundraising_counters'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='fundraiser',
+            index=models.Index(condition=models.Q(is_deleted=False), fields=['founder'], name='fundraiser_active_founder_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='fundraiser',
+            index=models.Index(condition=models.Q(is_deleted=False), fields=['is_active', '-created_at'], name='fundraiser_active_list_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='fundraiser',
+            index=models.Index(condition=models.Q(is_deleted=True), fields=['deleted_at'], name='fundraiser_deleted_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='membership',
+            index=models.Index(condition=models.Q(is_deleted=False), fields=['fundraiser', 'is_active'], name='membership_active_fund_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='membership',
+            index=models.Index(condition=models.Q(is_deleted=False), fields=['member', 'is_active'], name='membership_active_member_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='membership',
+            index=models.Index(condition=models.Q(is_deleted=True), fields=['deleted_at'], name='membership_deleted_idx'),
+        ),
+    ]
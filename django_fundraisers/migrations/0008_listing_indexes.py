@@ -0,0 +1,21 @@
+# Generated by Django 3.0.14 on 2026-10-19 15:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_fundraisers', '0007_soft_delete_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='campaign',
+            index=models.Index(fields=['-created_at', '-id'], name='campaign_list_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='fundraiser',
+            index=models.Index(condition=models.Q(('is_active', True), ('is_deleted', False), ('is_verified', True)), fields=['-created_at', '-id'], name='fundraiser_public_list_idx'),
+        ),
+    ]
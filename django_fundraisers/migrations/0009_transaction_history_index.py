@@ -0,0 +1,17 @@
+# Generated by Django 3.0.14 on 2026-10-19 15:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_fundraisers', '0008_listing_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='fundraisertransaction',
+            index=models.Index(fields=['fundraiser', 'created_at'], name='fundraiser_trx_history_idx'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 3.0.14 on 2026-10-19 15:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_fundraisers', '0009_transaction_history_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='fundraiser',
+            name='follower_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Follower count'),
+        ),
+        migrations.AddField(
+            model_name='fundraiser',
+            name='member_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Member count'),
+        ),
+        migrations.AddIndex(
+            model_name='membership',
+            index=models.Index(condition=models.Q(is_deleted=False), fields=['member', 'is_follower', 'fundraiser'], name='membership_follower_idx'),
+        ),
+    ]
@@ -0,0 +1,85 @@
+# Generated by Django 3.0.14 on 2026-10-19 15:44
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+DOCUMENT_TABLE = 'django_fundraisers_searchdocument'
+
+# Must match SEARCH_VECTOR in django_fundraisers.search for the planner to use the index
+POSTGRESQL_SEARCH_INDEX = """
+CREATE INDEX "{table}_vector_idx" ON "{table}" USING GIN ((
+    setweight(to_tsvector('simple'::regconfig, "title"), 'A') ||
+    setweight(to_tsvector('simple'::regconfig, "body"), 'B')
+));
+"""
+
+SQLITE_SEARCH_STATEMENTS = [
+    """CREATE VIRTUAL TABLE "{table}_fts" USING fts5(
+        title, body, content="{table}", content_rowid="id"
+    )""",
+    """CREATE TRIGGER "{table}_fts_insert" AFTER INSERT ON "{table}" BEGIN
+        INSERT INTO "{table}_fts" (rowid, title, body) VALUES (new.id, new.title, new.body);
+    END""",
+    """CREATE TRIGGER "{table}_fts_delete" AFTER DELETE ON "{table}" BEGIN
+        INSERT INTO "{table}_fts" ("{table}_fts", rowid, title, body) VALUES ('delete', old.id, old.title, old.body);
+    END""",
+    """CREATE TRIGGER "{table}_fts_update" AFTER UPDATE ON "{table}" BEGIN
+        INSERT INTO "{table}_fts" ("{table}_fts", rowid, title, body) VALUES ('delete', old.id, old.title, old.body);
+        INSERT INTO "{table}_fts" (rowid, title, body) VALUES (new.id, new.title, new.body);
+    END""",
+]
+
+
+def sqlite_has_fts5(connection):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+        return bool(cursor.fetchone()[0])
+
+
+def create_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'postgresql':
+        schema_editor.execute(POSTGRESQL_SEARCH_INDEX.format(table=DOCUMENT_TABLE))
+    elif connection.vendor == 'sqlite' and sqlite_has_fts5(connection):
+        # External content table, triggers keep it in step with the documents
+        for statement in SQLITE_SEARCH_STATEMENTS:
+            schema_editor.execute(statement.format(table=DOCUMENT_TABLE))
+    # Other backends fall back to icontains lookups
+
+
+def drop_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS "%s_vector_idx"' % DOCUMENT_TABLE)
+    elif connection.vendor == 'sqlite':
+        for suffix in ('insert', 'delete', 'update'):
+            schema_editor.execute('DROP TRIGGER IF EXISTS "%s_fts_%s"' % (DOCUMENT_TABLE, suffix))
+        schema_editor.execute('DROP TABLE IF EXISTS "%s_fts"' % DOCUMENT_TABLE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('django_fundraisers', '0010_membership_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_id', models.UUIDField(verbose_name='object id')),
+                ('title', models.CharField(max_length=255, verbose_name='title')),
+                ('body', models.TextField(blank=True, verbose_name='body')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='updated at')),
+                ('content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='contenttypes.ContentType', verbose_name='content type')),
+            ],
+            options={
+                'verbose_name': 'Search document',
+                'verbose_name_plural': 'Search documents',
+                'unique_together': {('content_type', 'object_id')},
+            },
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
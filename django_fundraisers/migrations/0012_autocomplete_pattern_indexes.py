@@ -0,0 +1,23 @@
+# Generated by Django 3.0.14 on 2026-10-19 15:46
+
+from django.db import migrations
+
+from django_fundraisers.utils.indexes import AddPrefixIndexes
+
+
+# Used by the istartswith lookups of the admin autocomplete endpoints
+PREFIX_INDEXES = [
+    ('django_fundraisers_fundraiser', 'name', 'fundraiser_name_prefix_idx'),
+    ('django_fundraisers_campaign', 'title', 'campaign_title_prefix_idx'),
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_fundraisers', '0011_search_document'),
+    ]
+
+    operations = [
+        AddPrefixIndexes(PREFIX_INDEXES),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 3.0.14 on 2026-10-19 16:55
+
+from django.db import migrations
+
+from django_fundraisers.rollups import rebuild_membership_counters
+
+
+def backfill_membership_counters(apps, schema_editor):
+    """ Counters added by 0010 start at 0, count live memberships """
+    rebuild_membership_counters(
+        apps.get_model('django_fundraisers', 'Fundraiser'),
+        apps.get_model('django_fundraisers', 'Membership'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_fundraisers', '0012_autocomplete_pattern_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_membership_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 3.0.14 on 2026-10-19 18:20
+
+from django.db import migrations
+
+from django_fundraisers.search import (
+    rebuild_documents, get_campaign_document, get_fundraiser_document)
+
+DOCUMENTS = [
+    ('campaign', get_campaign_document),
+    ('fundraiser', get_fundraiser_document),
+]
+
+
+def backfill_search_documents(apps, schema_editor):
+    """ Rows saved before 0011 have no document, index them like rebuild_search_index """
+    ContentType = apps.get_model('contenttypes', 'ContentType')
+    SearchDocument = apps.get_model('django_fundraisers', 'SearchDocument')
+    for model_name, get_document in DOCUMENTS:
+        model = apps.get_model('django_fundraisers', model_name)
+        if not model._base_manager.exists():
+            continue
+        content_type, _ = ContentType.objects.get_or_create(
+            app_label='django_fundraisers', model=model_name)
+        rebuild_documents(model, SearchDocument, content_type, get_document)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_fundraisers', '0013_backfill_membership_counters'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_search_documents, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,7 @@
 import enum
 import uuid
-from django.db import models
+from django.db import models, transaction, IntegrityError
+from django.db.models.functions import Trunc
 from django.db.utils import cached_property
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils import translation, timezone
@@ -11,6 +12,7 @@ from django.shortcuts import reverse
 
 from django_numerators.models import NumeratorMixin
 from django_fundraisers.utils.slugify import unique_slugify
+from django_fundraisers.listing import invalidate_listings
 
 _ = translation.ugettext_lazy
 
@@ -24,17 +26,134 @@ class MaxLength(enum.Enum):
     RICHTEXT = 10000
 
 
-class BaseManager(models.Manager):
+class BaseQuerySet(models.QuerySet):
+    """
+        Bulk paranoid mechanism, each method runs as a single UPDATE
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.live_only = False
+
+    def _clone(self):
+        clone = super()._clone()
+        clone.live_only = self.live_only
+        return clone
+
+    def check_restorable(self):
+        """ Managers hiding soft deleted rows can never match one to restore """
+        if self.live_only:
+            raise TypeError(
+                "%s.objects hides soft deleted rows, restore through all_objects"
+                % self.model.__name__)
+
+    def soft_delete(self, deleted_by=None):
+        now = timezone.now()
+        updated = self.filter(is_deleted=False).update(
+            is_deleted=True,
+            deleted_at=now,
+            deleted_by=deleted_by,
+            modified_at=now)
+        if updated:
+            invalidate_listings(self.model)
+        return updated
+
+    def restore(self):
+        self.check_restorable()
+        updated = self.filter(is_deleted=True).update(
+            is_deleted=False,
+            deleted_at=None,
+            deleted_by=None,
+            modified_at=timezone.now())
+        if updated:
+            invalidate_listings(self.model)
+        return updated
+
+    def purgeable(self, before):
+        return self.filter(is_deleted=True, deleted_at__lt=before)
+
+
+class BaseManager(models.Manager.from_queryset(BaseQuerySet)):
     """
         Implement paranoid mechanism queryset
     """
 
     def get_queryset(self):
-        return super().get_queryset().filter(is_deleted=False)
+        queryset = super().get_queryset().filter(is_deleted=False)
+        queryset.live_only = True
+        return queryset
+
 
-    def get(self, *args, **kwargs):
-        kwargs['is_deleted'] = False
-        return super().get(*args, **kwargs)
+class FundraiserQuerySet(BaseQuerySet):
+
+    def purgeable(self, before):
+        """
+            Fundraisers with ledger rows are kept, hard delete would cascade
+            into their transactions and withdraws and detach their donations
+        """
+        return super().purgeable(before).filter(
+            transactions__isnull=True,
+            withdraws__isnull=True,
+            donations__isnull=True)
+
+    def restore(self):
+        """
+            Slugs of soft deleted fundraisers may be reused by live ones,
+            colliding rows get a fresh slug before they turn live again
+        """
+        self.check_restorable()
+        with transaction.atomic():
+            rows = list(self.filter(is_deleted=True, slug__isnull=False).select_for_update().only(
+                'pk', 'name', 'slug'))
+            taken = set(self.model.objects.filter(
+                slug__in=[row.slug for row in rows]).values_list('slug', flat=True))
+            restoring = self.model._base_manager.filter(
+                models.Q(is_deleted=False) | models.Q(pk__in=[row.pk for row in rows]))
+            for row in rows:
+                if row.slug in taken:
+                    unique_slugify(row, row.name, queryset=restoring)
+                    self.model._base_manager.filter(pk=row.pk).update(slug=row.slug)
+                taken.add(row.slug)
+            return super().restore()
+
+    def followed_by(self, user):
+        """ Fundraisers followed by user, one range scan of the (member, is_follower) index """
+        return self.filter(pk__in=Membership.objects.filter(
+            member=user, is_follower=True
+        ).values('fundraiser_id'))
+
+
+class MembershipQuerySet(BaseQuerySet):
+    """
+        Bulk soft delete and restore also move the fundraiser
+        follower/member counters, which per instance signals can not see.
+    """
+
+    def get_counts(self):
+        """ Return {fundraiser_id: (followers, members)} of the rows """
+        return {
+            row['fundraiser_id']: (row['followers'], row['members'])
+            for row in self.order_by().values('fundraiser_id').annotate(
+                followers=models.Count('pk', filter=models.Q(is_follower=True)),
+                members=models.Count('pk', filter=models.Q(is_active=True)))
+        }
+
+    def shift_counts(self, is_deleted, sign, method, *args):
+        with transaction.atomic():
+            pks = list(self.filter(is_deleted=is_deleted).select_for_update().values_list('pk', flat=True))
+            queryset = self.model.all_objects.filter(pk__in=pks)
+            counts = queryset.get_counts()
+            updated = method(queryset, *args)
+            for fundraiser_id, (followers, members) in counts.items():
+                self.model.shift_counts(fundraiser_id, sign * followers, sign * members)
+        return updated
+
+    def soft_delete(self, deleted_by=None):
+        return self.shift_counts(False, -1, BaseQuerySet.soft_delete, deleted_by)
+
+    def restore(self):
+        self.check_restorable()
+        return self.shift_counts(True, 1, BaseQuerySet.restore)
 
 
 class BaseModel(models.Model):
@@ -42,6 +161,7 @@ class BaseModel(models.Model):
         abstract = True
 
     objects = BaseManager()
+    all_objects = models.Manager.from_queryset(BaseQuerySet)()
 
     id = models.UUIDField(
         default=uuid.uuid4,
@@ -91,6 +211,35 @@ class Fundraiser(NumeratorMixin, BaseModel):
     class Meta:
         verbose_name = _("Fundraiser")
         verbose_name_plural = _("Fundraisers")
+        constraints = [
+            models.UniqueConstraint(
+                fields=['slug'],
+                condition=models.Q(is_deleted=False),
+                name='unique_active_fundraiser_slug'),
+        ]
+        indexes = [
+            models.Index(
+                fields=['founder'],
+                name='fundraiser_active_founder_idx',
+                condition=models.Q(is_deleted=False)),
+            models.Index(
+                fields=['is_active', '-created_at'],
+                name='fundraiser_active_list_idx',
+                condition=models.Q(is_deleted=False)),
+            models.Index(
+                fields=['deleted_at'],
+                name='fundraiser_deleted_idx',
+                condition=models.Q(is_deleted=True)),
+            models.Index(
+                fields=['-created_at', '-id'],
+                name='fundraiser_public_list_idx',
+                condition=models.Q(is_deleted=False, is_active=True, is_verified=True)),
+        ]
+
+    objects = BaseManager.from_queryset(FundraiserQuerySet)()
+    all_objects = models.Manager.from_queryset(FundraiserQuerySet)()
+
+    slug_retries = 3
 
     name = models.CharField(
         max_length=255,
@@ -161,6 +310,34 @@ class Fundraiser(NumeratorMixin, BaseModel):
         max_digits=15,
         decimal_places=2,
         verbose_name=_("Balance"))
+    total_raised = models.DecimalField(
+        default=0,
+        max_digits=15,
+        decimal_places=2,
+        editable=False,
+        verbose_name=_("Total raised"))
+    donation_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name=_("Donation count"))
+    total_withdrawn = models.DecimalField(
+        default=0,
+        max_digits=15,
+        decimal_places=2,
+        editable=False,
+        verbose_name=_("Total withdrawn"))
+    last_donation_at = models.DateTimeField(
+        null=True, blank=True,
+        editable=False,
+        verbose_name=_("Last donation at"))
+    follower_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name=_("Follower count"))
+    member_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name=_("Member count"))
 
     is_organization = models.BooleanField(default=False)
     is_verified = models.BooleanField(default=False)
@@ -170,13 +347,23 @@ class Fundraiser(NumeratorMixin, BaseModel):
         return self.name
 
     def save(self, *args, **kwargs):
-        if not self.slug:
+        if self.slug:
+            return super().save(*args, **kwargs)
+        for retry in range(self.slug_retries):
             unique_slugify(self, self.name)
-        return super().save(*args, **kwargs)
+            try:
+                with transaction.atomic():
+                    return super().save(*args, **kwargs)
+            except IntegrityError:
+                # Slug taken by a concurrent save, allocate again
+                self.slug = None
+                if retry == self.slug_retries - 1:
+                    raise
 
     def update_balance(self, balance):
+        # Only write balance, a full save rewrites every column of a stale instance
         self.balance = balance
-        self.save()
+        type(self)._base_manager.filter(pk=self.pk).update(balance=balance)
 
     @property
     def opts(self):
@@ -194,6 +381,9 @@ class Campaign(NumeratorMixin):
     class Meta:
         verbose_name = _("Campaign")
         verbose_name_plural = _("Campaigns")
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='campaign_list_idx'),
+        ]
 
     id = models.UUIDField(
         default=uuid.uuid4,
@@ -228,10 +418,31 @@ class Campaign(NumeratorMixin):
         verbose_name=_('fundraiser'),
         on_delete=models.SET_NULL,
         related_name='campaigns')
+    total_raised = models.DecimalField(
+        default=0,
+        max_digits=15,
+        decimal_places=2,
+        editable=False,
+        verbose_name=_("Total raised"))
+    donation_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name=_("Donation count"))
+    last_donation_at = models.DateTimeField(
+        null=True, blank=True,
+        editable=False,
+        verbose_name=_("Last donation at"))
 
     def __str__(self):
         return self.title
 
+    @property
+    def progress(self):
+        """ Percentage of target donation raised, read from counter columns """
+        if not self.target_donation:
+            return 0
+        return min(int(self.total_raised * 100 / self.target_donation), 100)
+
     def get_absolute_url(self):
         return reverse('%s:%s' % (self.opts.app_label, self.opts.model_name), args=(self.slug,))
 
@@ -241,6 +452,30 @@ class Membership(BaseModel):
         verbose_name = _("Membership")
         verbose_name_plural = _("Memberships")
         unique_together = ('fundraiser', 'member')
+        indexes = [
+            models.Index(
+                fields=['fundraiser', 'is_active'],
+                name='membership_active_fund_idx',
+                condition=models.Q(is_deleted=False)),
+            models.Index(
+                fields=['member', 'is_active'],
+                name='membership_active_member_idx',
+                condition=models.Q(is_deleted=False)),
+            models.Index(
+                fields=['deleted_at'],
+                name='membership_deleted_idx',
+                condition=models.Q(is_deleted=True)),
+            models.Index(
+                fields=['member', 'is_follower', 'fundraiser'],
+                name='membership_follower_idx',
+                condition=models.Q(is_deleted=False)),
+        ]
+
+    objects = BaseManager.from_queryset(MembershipQuerySet)()
+    all_objects = models.Manager.from_queryset(MembershipQuerySet)()
+
+    # (fundraiser_id, follower, member) this row adds to the counters as stored
+    counted = (None, 0, 0)
 
     id = models.UUIDField(
         default=uuid.uuid4,
@@ -283,12 +518,104 @@ class Membership(BaseModel):
     def __str__(self):
         return self.id
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        loaded = {'fundraiser_id', 'is_deleted', 'is_follower', 'is_active'}.issubset(field_names)
+        # Deferred rows are read back on pre_save instead
+        instance.counted = instance.get_counted() if loaded else None
+        return instance
+
+    def get_counted(self):
+        if self.is_deleted:
+            return self.fundraiser_id, 0, 0
+        return self.fundraiser_id, int(self.is_follower), int(self.is_active)
+
+    @staticmethod
+    def shift_counts(fundraiser_id, followers, members):
+        if not fundraiser_id or not (followers or members):
+            return
+        Fundraiser._base_manager.filter(pk=fundraiser_id).update(
+            follower_count=models.F('follower_count') + followers,
+            member_count=models.F('member_count') + members)
+        invalidate_listings(Fundraiser)
+
+
+class FundraiserTransactionManager(models.Manager):
+    history_intervals = (
+        ('day', 1), ('week', 7), ('month', 31), ('quarter', 92), ('year', 366)
+    )
+
+    def get_signed_total(self):
+        return models.Sum(models.Case(
+            models.When(flow='OUT', then=-models.F('total')),
+            default=models.F('total'),
+            output_field=models.DecimalField(max_digits=15, decimal_places=2)))
+
+    def get_history_interval(self, interval, since, until, max_points):
+        """ Requested interval, or the finest coarser one keeping the series under max_points """
+        names = [name for name, _ in self.history_intervals]
+        if interval not in names:
+            raise ValueError("Interval must be one of %s" % ", ".join(names))
+        span = max((until - since).days, 0) + 1
+        for name, days in self.history_intervals[names.index(interval):]:
+            if span / days <= max_points:
+                return name
+        return names[-1]
+
+    def get_balance_history(self, fundraiser, interval='month', since=None, until=None, max_points=500):
+        """
+            Closing balance of each interval bucket. Totals are grouped
+            in the database, so the result has at most max_points rows
+            whatever the number of transactions.
+        """
+        queryset = self.filter(fundraiser=fundraiser).order_by()
+        until = until or timezone.now()
+        if since is None:
+            since = queryset.aggregate(since=models.Min('created_at'))['since'] or until
+        interval = self.get_history_interval(interval, since, until, max_points)
+        opening = queryset.filter(created_at__lt=since).aggregate(
+            balance=self.get_signed_total())['balance'] or 0
+        buckets = queryset.filter(
+            created_at__gte=since, created_at__lte=until
+        ).annotate(
+            bucket=Trunc('created_at', interval)
+        ).values('bucket').annotate(
+            total_in=models.Sum('total', filter=models.Q(flow='IN')),
+            total_out=models.Sum('total', filter=models.Q(flow='OUT')),
+            count=models.Count('pk'),
+        ).order_by('bucket')
+        balance = opening
+        points = []
+        for bucket in buckets:
+            total_in, total_out = bucket['total_in'] or 0, bucket['total_out'] or 0
+            balance += total_in - total_out
+            points.append({
+                'date': bucket['bucket'],
+                'in': total_in,
+                'out': total_out,
+                'count': bucket['count'],
+                'balance': balance,
+            })
+        return {
+            'interval': interval,
+            'since': since,
+            'until': until,
+            'opening_balance': opening,
+            'points': points,
+        }
+
 
 class FundraiserTransaction(NumeratorMixin):
     class Meta:
         ordering = ['-created_at']
         verbose_name = _('Transaction')
         verbose_name_plural = _('Transactions')
+        indexes = [
+            models.Index(fields=['fundraiser', 'created_at'], name='fundraiser_trx_history_idx'),
+        ]
+
+    objects = FundraiserTransactionManager()
 
     id = models.UUIDField(
         default=uuid.uuid4,
@@ -378,3 +705,35 @@ class FundraiserTransaction(NumeratorMixin):
         self.total = self.get_total()
         self.calculate_balance()
         super().save(*args, **kwargs)
+
+
+class SearchDocument(models.Model):
+    """
+        Searchable text of a registered object, kept in step on save by
+        django_fundraisers.search. Full-text indexes are vendor specific,
+        see migration 0011: a GIN tsvector expression index on PostgreSQL
+        and an FTS5 external content table on SQLite.
+    """
+    class Meta:
+        verbose_name = _("Search document")
+        verbose_name_plural = _("Search documents")
+        unique_together = ('content_type', 'object_id')
+
+    content_type = models.ForeignKey(
+        ContentType,
+        on_delete=models.CASCADE,
+        verbose_name=_('content type'))
+    object_id = models.UUIDField(
+        verbose_name=_('object id'))
+    title = models.CharField(
+        max_length=255,
+        verbose_name=_('title'))
+    body = models.TextField(
+        blank=True,
+        verbose_name=_('body'))
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name=_('updated at'))
+
+    def __str__(self):
+        return self.title
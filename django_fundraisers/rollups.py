@@ -0,0 +1,25 @@
+"""
+    Rebuild queries for denormalized fundraiser counters. Models are passed
+    in so data migrations can run them against historical models.
+"""
+from django.db import models, transaction
+from django.db.models.functions import Coalesce
+
+
+def _membership_count(membership_model, **filters):
+    memberships = membership_model._base_manager.filter(
+        fundraiser_id=models.OuterRef('pk'), is_deleted=False, **filters
+    ).order_by().values('fundraiser_id')
+    return Coalesce(
+        models.Subquery(
+            memberships.annotate(total=models.Count('pk')).values('total')[:1],
+            output_field=models.IntegerField()),
+        models.Value(0))
+
+
+def rebuild_membership_counters(fundraiser_model, membership_model):
+    """ Recompute follower_count/member_count of every fundraiser, returns rows updated """
+    with transaction.atomic():
+        return fundraiser_model._base_manager.update(
+            follower_count=_membership_count(membership_model, is_follower=True),
+            member_count=_membership_count(membership_model, is_active=True))
@@ -0,0 +1,144 @@
+import re
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection, transaction
+from django.db.models import Q
+
+from .models import Fundraiser, Campaign, SearchDocument
+
+FUNDRAISER_SEARCH_LIMIT = getattr(settings, 'FUNDRAISER_SEARCH_LIMIT', 20)
+
+DOCUMENT_TABLE = SearchDocument._meta.db_table
+
+# Same expression as the GIN index of migration 0011
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('simple'::regconfig, d.title), 'A') || "
+    "setweight(to_tsvector('simple'::regconfig, d.body), 'B')"
+)
+
+registry = {}
+
+
+def register(model, get_document):
+    """ Index model instances, get_document returns their (title, body) """
+    registry[model] = get_document
+
+
+def get_campaign_document(campaign):
+    return campaign.title, '\n'.join(filter(None, [campaign.summary, campaign.body]))
+
+
+def get_fundraiser_document(fundraiser):
+    return fundraiser.name, ' '.join(filter(None, [fundraiser.city, fundraiser.province]))
+
+
+register(Campaign, get_campaign_document)
+register(Fundraiser, get_fundraiser_document)
+
+
+def index_object(obj):
+    """ Upsert the search document of one object, called on save """
+    title, body = registry[type(obj)](obj)
+    SearchDocument.objects.update_or_create(
+        content_type=ContentType.objects.get_for_model(obj),
+        object_id=obj.pk,
+        defaults={'title': (title or '')[:255], 'body': body or ''})
+
+
+def unindex_object(obj):
+    SearchDocument.objects.filter(
+        content_type=ContentType.objects.get_for_model(obj),
+        object_id=obj.pk).delete()
+
+
+def rebuild_documents(model, document_model, content_type, get_document, batch_size=1000):
+    """ Replace the documents of content_type from every model row, returns the number indexed """
+    indexed = 0
+    with transaction.atomic():
+        document_model.objects.filter(content_type=content_type).delete()
+        batch = []
+        for obj in model._base_manager.order_by('pk').iterator(chunk_size=batch_size):
+            title, body = get_document(obj)
+            batch.append(document_model(
+                content_type=content_type, object_id=obj.pk,
+                title=(title or '')[:255], body=body or ''))
+            if len(batch) >= batch_size:
+                document_model.objects.bulk_create(batch)
+                indexed += len(batch)
+                batch = []
+        document_model.objects.bulk_create(batch)
+    return indexed + len(batch)
+
+
+def rebuild_index(model, batch_size=1000):
+    """ Replace every document of a model, returns the number indexed """
+    return rebuild_documents(
+        model, SearchDocument, ContentType.objects.get_for_model(model),
+        registry[model], batch_size)
+
+
+def get_terms(query):
+    return re.findall(r'\w+', query.lower())[:16]
+
+
+_fts5_tables = {}
+
+
+def has_fts5_table():
+    """ Whether migration 0011 created the FTS5 table, looked up once per database """
+    if connection.alias not in _fts5_tables:
+        _fts5_tables[connection.alias] = (
+            '%s_fts' % DOCUMENT_TABLE in connection.introspection.table_names())
+    return _fts5_tables[connection.alias]
+
+
+def search_postgresql(content_type, query, limit):
+    sql = (
+        "SELECT d.object_id, ts_rank_cd(%s, q) AS rank "
+        "FROM %s d, plainto_tsquery('simple'::regconfig, %%s) q "
+        "WHERE d.content_type_id = %%s AND (%s) @@ q "
+        "ORDER BY rank DESC LIMIT %%s"
+    ) % (SEARCH_VECTOR, connection.ops.quote_name(DOCUMENT_TABLE), SEARCH_VECTOR)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [query, content_type.pk, limit])
+        return cursor.fetchall()
+
+
+def search_sqlite(content_type, terms, limit):
+    table = connection.ops.quote_name(DOCUMENT_TABLE)
+    fts = connection.ops.quote_name(DOCUMENT_TABLE + '_fts')
+    # Quoted terms are plain tokens, the last one matches as a prefix
+    match = ' '.join('"%s"' % term for term in terms) + '*'
+    sql = (
+        "SELECT d.object_id, -bm25(%s, 10.0, 1.0) AS rank "
+        "FROM %s JOIN %s d ON d.id = %s.rowid "
+        "WHERE %s MATCH %%s AND d.content_type_id = %%s "
+        "ORDER BY rank DESC LIMIT %%s"
+    ) % (fts, fts, table, fts, fts)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [match, content_type.pk, limit])
+        return cursor.fetchall()
+
+
+def search_fallback(content_type, terms, limit):
+    queryset = SearchDocument.objects.filter(content_type=content_type)
+    for term in terms:
+        queryset = queryset.filter(Q(title__icontains=term) | Q(body__icontains=term))
+    return [(object_id, 0) for object_id in queryset.values_list('object_id', flat=True)[:limit]]
+
+
+def search(model, query, limit=FUNDRAISER_SEARCH_LIMIT):
+    """ Return [(pk, rank)] of model instances matching query, best first """
+    terms = get_terms(query)
+    if not terms:
+        return []
+    content_type = ContentType.objects.get_for_model(model)
+    if connection.vendor == 'postgresql':
+        rows = search_postgresql(content_type, ' '.join(terms), limit)
+    elif connection.vendor == 'sqlite' and has_fts5_table():
+        rows = search_sqlite(content_type, terms, limit)
+    else:
+        rows = search_fallback(content_type, terms, limit)
+    field = SearchDocument._meta.get_field('object_id')
+    return [(field.to_python(object_id), rank) for object_id, rank in rows]
@@ -0,0 +1,61 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from .listing import invalidate_listings
+from .search import index_object, unindex_object
+from .models import Fundraiser, Campaign, Membership
+
+
+@receiver(post_save, sender=Fundraiser)
+@receiver(post_delete, sender=Fundraiser)
+@receiver(post_save, sender=Campaign)
+@receiver(post_delete, sender=Campaign)
+def invalidate_public_listings(sender, instance, **kwargs):
+    invalidate_listings(sender)
+
+
+@receiver(post_save, sender=Fundraiser)
+@receiver(post_save, sender=Campaign)
+def update_search_document(sender, instance, **kwargs):
+    """ Incremental index update, the full-text index follows its document row """
+    index_object(instance)
+
+
+@receiver(post_delete, sender=Fundraiser)
+@receiver(post_delete, sender=Campaign)
+def delete_search_document(sender, instance, **kwargs):
+    unindex_object(instance)
+
+
+@receiver(pre_save, sender=Membership)
+def load_membership_counted(sender, instance, **kwargs):
+    if instance.counted is not None:
+        return
+    stored = Membership._base_manager.filter(pk=instance.pk).values_list(
+        'fundraiser_id', 'is_deleted', 'is_follower', 'is_active').first()
+    if stored is None:
+        instance.counted = Membership.counted
+    else:
+        fundraiser_id, is_deleted, is_follower, is_active = stored
+        instance.counted = (fundraiser_id, 0, 0) if is_deleted else (
+            fundraiser_id, int(is_follower), int(is_active))
+
+
+@receiver(post_save, sender=Membership)
+def update_membership_counts(sender, instance, **kwargs):
+    """ Move fundraiser counters by the difference between stored and saved flags """
+    old_fundraiser_id, old_followers, old_members = instance.counted
+    new_fundraiser_id, new_followers, new_members = instance.get_counted()
+    if old_fundraiser_id == new_fundraiser_id:
+        Membership.shift_counts(
+            new_fundraiser_id, new_followers - old_followers, new_members - old_members)
+    else:
+        Membership.shift_counts(old_fundraiser_id, -old_followers, -old_members)
+        Membership.shift_counts(new_fundraiser_id, new_followers, new_members)
+    instance.counted = new_fundraiser_id, new_followers, new_members
+
+
+@receiver(post_delete, sender=Membership)
+def remove_membership_counts(sender, instance, **kwargs):
+    fundraiser_id, followers, members = instance.counted or instance.get_counted()
+    Membership.shift_counts(fundraiser_id, -followers, -members)
@@ -0,0 +1,90 @@
+import csv
+import json
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import FundraiserTransaction
+
+FUNDRAISER_STATEMENT_CHUNK_SIZE = getattr(settings, 'FUNDRAISER_STATEMENT_CHUNK_SIZE', 2000)
+
+STATEMENT_FIELDS = [
+    'inner_id', 'created_at', 'flow', 'amount', 'rate', 'total',
+    'old_balance', 'balance', 'note', 'reference_type', 'reference_id',
+    'reference_number', 'reference_name',
+]
+
+
+class Echo:
+    """ File-like object whose write returns the value, for streaming csv rows """
+
+    def write(self, value):
+        return value
+
+
+def iter_chunks(queryset, chunk_size):
+    """ Lists of chunk_size rows read through a server-side cursor where supported """
+    chunk = []
+    for obj in queryset.iterator(chunk_size=chunk_size):
+        chunk.append(obj)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def resolve_references(transactions):
+    """ Referenced objects of a chunk, one query per content type instead of per row """
+    object_ids = {}
+    for trx in transactions:
+        if trx.content_type_id and trx.object_id:
+            object_ids.setdefault(trx.content_type_id, set()).add(trx.object_id)
+    references = {}
+    for content_type_id, ids in object_ids.items():
+        model = ContentType.objects.get_for_id(content_type_id).model_class()
+        if model is None:
+            continue
+        for obj in model._base_manager.filter(pk__in=ids):
+            references[(content_type_id, str(obj.pk))] = obj
+    return references
+
+
+def iter_statement(fundraiser, chunk_size=FUNDRAISER_STATEMENT_CHUNK_SIZE):
+    """ Statement rows of a fundraiser in posting order, memory bounded by chunk_size """
+    queryset = FundraiserTransaction.objects.filter(
+        fundraiser=fundraiser
+    ).order_by('created_at', 'id')
+    for chunk in iter_chunks(queryset, chunk_size):
+        references = resolve_references(chunk)
+        for trx in chunk:
+            reference = references.get((trx.content_type_id, trx.object_id))
+            yield {
+                'inner_id': trx.inner_id,
+                'created_at': trx.created_at,
+                'flow': trx.flow,
+                'amount': trx.amount,
+                'rate': trx.rate,
+                'total': trx.total,
+                'old_balance': trx.old_balance,
+                'balance': trx.balance,
+                'note': trx.note,
+                'reference_type': reference._meta.model_name if reference else None,
+                'reference_id': trx.object_id,
+                'reference_number': getattr(reference, 'inner_id', None),
+                'reference_name': getattr(reference, 'fullname', None),
+            }
+
+
+def iter_statement_csv(fundraiser):
+    writer = csv.DictWriter(Echo(), fieldnames=STATEMENT_FIELDS)
+    yield writer.writeheader()
+    for row in iter_statement(fundraiser):
+        row['created_at'] = row['created_at'].isoformat()
+        yield writer.writerow(row)
+
+
+def iter_statement_jsonl(fundraiser):
+    for row in iter_statement(fundraiser):
+        yield json.dumps(row, cls=DjangoJSONEncoder) + '\n'
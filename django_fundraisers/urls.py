@@ -0,0 +1,13 @@
+from django.urls import path
+
+from . import views
+
+app_name = 'django_fundraisers'
+
+urlpatterns = [
+    path('campaigns/', views.listing_html, {'listing': 'campaign', 'kind': 'html'}, name='campaign_list'),
+    path('campaigns.json', views.listing_json, {'listing': 'campaign', 'kind': 'json'}, name='campaign_list_json'),
+    path('fundraisers/', views.listing_html, {'listing': 'fundraiser', 'kind': 'html'}, name='fundraiser_list'),
+    path('fundraisers.json', views.listing_json, {'listing': 'fundraiser', 'kind': 'json'}, name='fundraiser_list_json'),
+    path('search.json', views.search_json, name='search_json'),
+]
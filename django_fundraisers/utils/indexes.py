@@ -0,0 +1,37 @@
+from django.db.migrations.operations.base import Operation
+
+
+class AddPrefixIndexes(Operation):
+    """
+        Expression indexes matching the UPPER("col"::text) LIKE UPPER(%s)
+        of istartswith lookups, ``indexes`` is [(table, column, index name)].
+        Only PostgreSQL needs them, other backends are left untouched.
+    """
+    reversible = True
+    reduces_to_sql = False
+
+    def __init__(self, indexes):
+        self.indexes = indexes
+
+    def deconstruct(self):
+        return self.__class__.__name__, [self.indexes], {}
+
+    def state_forwards(self, app_label, state):
+        pass
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != 'postgresql':
+            return
+        quote = schema_editor.quote_name
+        for table, column, name in self.indexes:
+            schema_editor.execute('CREATE INDEX %s ON %s (UPPER(%s::text) text_pattern_ops)' % (
+                quote(name), quote(table), quote(column)))
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != 'postgresql':
+            return
+        for table, column, name in self.indexes:
+            schema_editor.execute('DROP INDEX IF EXISTS %s' % schema_editor.quote_name(name))
+
+    def describe(self):
+        return "Add prefix indexes %s" % ", ".join(name for _, _, name in self.indexes)
@@ -33,10 +33,18 @@ def unique_slugify(instance, value, slug_field_name='slug', queryset=None,
     if instance.pk:
         queryset = queryset.exclude(pk=instance.pk)
 
-    # Find a unique slug. If one matches, at '-2' to the end and try again
-    # (then '-3', etc).
+    # Fetch every taken slug sharing the stem with one prefix query, then
+    # pick the first free '-2', '-3', ... suffix in memory. The stem leaves
+    # room for suffixes that truncate the original slug.
+    stem = original_slug
+    if slug_len:
+        stem = original_slug[:max(slug_len - 10, 0)]
+    taken = set(queryset.filter(
+        **{'%s__startswith' % slug_field_name: stem}
+    ).values_list(slug_field_name, flat=True))
+
     next = 2
-    while not slug or queryset.filter(**{slug_field_name: slug}):
+    while not slug or slug in taken:
         slug = original_slug
         end = '%s%s' % (slug_separator, next)
         if slug_len and len(slug) + len(end) > slug_len:
@@ -0,0 +1,245 @@
+import datetime
+
+from django.core.cache import cache
+from django.core.exceptions import PermissionDenied
+from django.http import JsonResponse, HttpResponseBadRequest, StreamingHttpResponse
+from django.shortcuts import render, get_object_or_404
+from django.template.loader import render_to_string
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime, parse_date
+from django.utils.safestring import mark_safe
+from django.views.decorators.http import condition, require_GET
+from django.views.decorators.vary import vary_on_cookie
+
+from .listing import (
+    FUNDRAISER_LISTING_CACHE_TIMEOUT,
+    get_page_params, get_page, get_cache_key, get_etag, get_listing_version
+)
+from .models import Fundraiser, Campaign, FundraiserTransaction
+from .search import FUNDRAISER_SEARCH_LIMIT, search
+from .statements import iter_statement_csv, iter_statement_jsonl
+
+
+def get_public_campaigns():
+    return Campaign.objects.filter(
+        fundraiser__is_active=True,
+        fundraiser__is_verified=True,
+        fundraiser__is_deleted=False,
+    ).select_related('fundraiser')
+
+
+def get_public_fundraisers():
+    return Fundraiser.objects.filter(is_active=True, is_verified=True)
+
+
+def serialize_campaign(campaign):
+    return {
+        'id': str(campaign.pk),
+        'inner_id': campaign.inner_id,
+        'title': campaign.title,
+        'summary': campaign.summary,
+        'target_donation': campaign.target_donation,
+        'total_raised': campaign.total_raised,
+        'donation_count': campaign.donation_count,
+        'progress': campaign.progress,
+        'fundraiser': {
+            'id': str(campaign.fundraiser.pk),
+            'name': campaign.fundraiser.name,
+            'slug': campaign.fundraiser.slug,
+        },
+        'created_at': campaign.created_at,
+    }
+
+
+def serialize_fundraiser(fundraiser):
+    return {
+        'id': str(fundraiser.pk),
+        'inner_id': fundraiser.inner_id,
+        'name': fundraiser.name,
+        'slug': fundraiser.slug,
+        'city': fundraiser.city,
+        'is_organization': fundraiser.is_organization,
+        'total_raised': fundraiser.total_raised,
+        'donation_count': fundraiser.donation_count,
+        'last_donation_at': fundraiser.last_donation_at,
+        'follower_count': fundraiser.follower_count,
+        'member_count': fundraiser.member_count,
+        'created_at': fundraiser.created_at,
+    }
+
+
+LISTINGS = {
+    'campaign': (Campaign, get_public_campaigns, serialize_campaign),
+    'fundraiser': (Fundraiser, get_public_fundraisers, serialize_fundraiser),
+}
+
+
+@require_GET
+def search_json(request):
+    """
+        Ranked full-text search over campaigns or fundraisers, ``type``
+        selects which. Hits are loaded through the public listing
+        querysets so inactive or deleted rows never show.
+    """
+    listing = request.GET.get('type', 'campaign')
+    if listing not in LISTINGS:
+        return HttpResponseBadRequest("Invalid type")
+    try:
+        limit = min(int(request.GET.get('limit', FUNDRAISER_SEARCH_LIMIT)), 100)
+    except ValueError:
+        return HttpResponseBadRequest("Invalid limit")
+    model, get_queryset, serialize = LISTINGS[listing]
+    # Oversample, some hits may not be public
+    hits = search(model, request.GET.get('q', ''), max(limit, 1) * 2)
+    objects = get_queryset().in_bulk([pk for pk, _ in hits])
+    results = []
+    for pk, rank in hits:
+        if pk in objects and len(results) < limit:
+            results.append(dict(serialize(objects[pk]), rank=rank))
+    return JsonResponse({'results': results})
+
+
+def listing_etag(request, listing, kind):
+    try:
+        cursor, limit = get_page_params(request)
+    except ValueError:
+        return None
+    return get_etag(LISTINGS[listing][0], kind, cursor, limit)
+
+
+def listing_html_etag(request, listing, kind):
+    """ The page around the cached items shows the signed in user """
+    etag = listing_etag(request, listing, kind)
+    if etag is None:
+        return None
+    return '%s-%s' % (etag, request.user.pk or 0)
+
+
+def listing_last_modified(request, listing, kind):
+    _, modified = get_listing_version(LISTINGS[listing][0])
+    return datetime.datetime.fromtimestamp(modified, tz=timezone.utc)
+
+
+def get_listing_page(listing, kind, cursor, limit, render_page):
+    """ Cached page content, keyed by the listing version so any change drops every page """
+    model, get_queryset, serialize = LISTINGS[listing]
+    key = get_cache_key(model, kind, cursor, limit)
+    content = cache.get(key)
+    if content is None:
+        objects, next_cursor = get_page(get_queryset(), cursor, limit)
+        content = render_page(objects, next_cursor, serialize)
+        cache.set(key, content, FUNDRAISER_LISTING_CACHE_TIMEOUT)
+    return content
+
+
+@require_GET
+@vary_on_cookie
+@condition(etag_func=listing_html_etag, last_modified_func=listing_last_modified)
+def listing_html(request, listing, kind):
+    """
+        Public listing page, the rendered items fragment is cached per page
+        and shared by every visitor, so it is rendered without the request.
+    """
+    try:
+        cursor, limit = get_page_params(request)
+    except ValueError as err:
+        return HttpResponseBadRequest(str(err))
+
+    def render_page(objects, next_cursor, serialize):
+        return {
+            'items': render_to_string(
+                'django_fundraisers/includes/%s_items.html' % listing,
+                {'objects': objects}),
+            'next': next_cursor,
+        }
+
+    page = get_listing_page(listing, kind, cursor, limit, render_page)
+    return render(request, 'django_fundraisers/%s_list.html' % listing, {
+        'items': mark_safe(page['items']),
+        'next': page['next'],
+        'limit': limit,
+    })
+
+
+@require_GET
+@condition(etag_func=listing_etag, last_modified_func=listing_last_modified)
+def listing_json(request, listing, kind):
+    try:
+        cursor, limit = get_page_params(request)
+    except ValueError as err:
+        return HttpResponseBadRequest(str(err))
+
+    def render_page(objects, next_cursor, serialize):
+        return {
+            'results': [serialize(obj) for obj in objects],
+            'next': next_cursor,
+        }
+
+    return JsonResponse(get_listing_page(listing, kind, cursor, limit, render_page))
+
+
+def user_can_view_fundraiser(user, fundraiser):
+    """ Staff with view permission, the founder or an admin member of the fundraiser """
+    if user.has_perm('django_fundraisers.view_fundraiser') or fundraiser.founder_id == user.pk:
+        return True
+    return fundraiser.members.filter(member=user, is_admin=True).exists()
+
+
+def get_fundraiser_or_403(request, pk):
+    fundraiser = get_object_or_404(Fundraiser, pk=pk)
+    if not user_can_view_fundraiser(request.user, fundraiser):
+        raise PermissionDenied
+    return fundraiser
+
+
+def parse_moment(value):
+    """ Aware datetime from an ISO date or datetime query value """
+    if not value:
+        return None
+    moment = parse_datetime(value)
+    if moment is None:
+        date = parse_date(value)
+        if date is None:
+            raise ValueError("Invalid date %s" % value)
+        moment = datetime.datetime.combine(date, datetime.time.min)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+@require_GET
+def fundraiser_balance_history(request, pk):
+    """
+        Downsampled balance series for dashboards, ``interval`` is one
+        of day, week, month, quarter or year and is coarsened when the
+        range would return more than ``points`` buckets.
+    """
+    fundraiser = get_fundraiser_or_403(request, pk)
+    try:
+        max_points = min(int(request.GET.get('points', 500)), 2000)
+        history = FundraiserTransaction.objects.get_balance_history(
+            fundraiser,
+            interval=request.GET.get('interval', 'month'),
+            since=parse_moment(request.GET.get('since')),
+            until=parse_moment(request.GET.get('until')),
+            max_points=max(max_points, 1))
+    except ValueError as err:
+        return HttpResponseBadRequest(str(err))
+    return JsonResponse(history)
+
+
+STATEMENT_FORMATS = {
+    'csv': (iter_statement_csv, 'text/csv'),
+    'jsonl': (iter_statement_jsonl, 'application/x-ndjson'),
+}
+
+
+@require_GET
+def fundraiser_statement(request, pk, format):
+    """ Full transaction statement streamed row by row, never held in memory """
+    fundraiser = get_fundraiser_or_403(request, pk)
+    iter_rows, content_type = STATEMENT_FORMATS[format]
+    response = StreamingHttpResponse(iter_rows(fundraiser), content_type=content_type)
+    response['Content-Disposition'] = 'attachment; filename="statement-%s.%s"' % (
+        fundraiser.inner_id, format)
+    return response
@@ -186,6 +186,25 @@ class NumeratorMixinBase(models.Model):
         self.numerator.save()
         super().save(*args, **kwargs)
 
+    @classmethod
+    def bulk_update_inner_id(cls, objs):
+        """
+            Generate inner_id for many unsaved instances before bulk_create,
+            each numerator is fetched and saved once
+        """
+        numerators = {}
+        for obj in objs:
+            date = obj.get_date_field()
+            month = date.month if obj.reset_mode == NumeratorReset.MONTHLY else 0
+            key = (obj.get_doc_prefix(), date.year, month)
+            if key not in numerators:
+                numerators[key] = obj.get_numerator()
+            obj.numerator = numerators[key]
+            obj.update_inner_id()
+        for numerator in numerators.values():
+            numerator.save()
+        return objs
+
 
 class NumeratorMixin(NumeratorMixinBase):
     """ Mixin for Numerator Model """
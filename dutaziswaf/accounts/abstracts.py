@@ -6,17 +6,56 @@ from django.utils import timezone, translation
 _ = translation.ugettext_lazy
 
 
-class BaseManager(models.Manager):
+class BaseQuerySet(models.QuerySet):
+    """
+        Bulk paranoid mechanism, each method runs as a single UPDATE
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.live_only = False
+
+    def _clone(self):
+        clone = super()._clone()
+        clone.live_only = self.live_only
+        return clone
+
+    def check_restorable(self):
+        """ Managers hiding soft deleted rows can never match one to restore """
+        if self.live_only:
+            raise TypeError(
+                "%s.objects hides soft deleted rows, restore through all_objects"
+                % self.model.__name__)
+
+    def soft_delete(self, deleted_by=None):
+        now = timezone.now()
+        return self.filter(is_deleted=False).update(
+            is_deleted=True,
+            deleted_at=now,
+            deleted_by=deleted_by,
+            modified_at=now)
+
+    def restore(self):
+        self.check_restorable()
+        return self.filter(is_deleted=True).update(
+            is_deleted=False,
+            deleted_at=None,
+            deleted_by=None,
+            modified_at=timezone.now())
+
+    def purgeable(self, before):
+        return self.filter(is_deleted=True, deleted_at__lt=before)
+
+
+class BaseManager(models.Manager.from_queryset(BaseQuerySet)):
     """
         Implement paranoid mechanism queryset
     """
 
     def get_queryset(self):
-        return super().get_queryset().filter(is_deleted=False)
-
-    def get(self, *args, **kwargs):
-        kwargs['is_deleted'] = False
-        return super().get(*args, **kwargs)
+        queryset = super().get_queryset().filter(is_deleted=False)
+        queryset.live_only = True
+        return queryset
 
 
 class BaseModel(models.Model):
@@ -24,6 +63,7 @@ class BaseModel(models.Model):
         abstract = True
 
     objects = BaseManager()
+    all_objects = models.Manager.from_queryset(BaseQuerySet)()
 
     id = models.UUIDField(
         default=uuid.uuid4,
@@ -0,0 +1,23 @@
+# Generated by Django 3.0.14 on 2026-10-19 15:46
+
+from django.db import migrations
+
+from django_fundraisers.utils.indexes import AddPrefixIndexes
+
+
+# Used by the istartswith lookups of the admin autocomplete endpoints
+PREFIX_INDEXES = [
+    ('dutaziswaf_accounts_user', 'username', 'user_username_prefix_idx'),
+    ('dutaziswaf_accounts_user', 'first_name', 'user_first_name_prefix_idx'),
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dutaziswaf_accounts', '0001_initial'),
+    ]
+
+    operations = [
+        AddPrefixIndexes(PREFIX_INDEXES),
+    ]
@@ -0,0 +1 @@
+default_app_config = 'dutaziswaf.donations.apps.AppConfig'
@@ -3,13 +3,14 @@ from wagtail.contrib.modeladmin.options import ModelAdmin, ModelAdminGroup, mode
 from wagtail.contrib.modeladmin.helpers import PermissionHelper
 from wagtail.admin.edit_handlers import FieldPanel, MultiFieldPanel, ObjectList
 
-from django_extra_referrals.models import Referral, Transaction
+from django_extra_referrals.models import Referral, Transaction, TransactionArchive
 from django_fundraisers.models import Fundraiser, FundraiserTransaction
 from django_cashflow.models import CashAccount, BankAccount
 
 from dutaziswaf.donations.models import (
     Donation, Agreement, PaymentConfirmation, FundraiserWithdraw, ReferralWithdraw
 )
+from dutaziswaf.donations.widgets import AutocompleteSelect
 
 _ = translation.ugettext_lazy
 
@@ -159,6 +160,18 @@ class ReferralTransactionModelAdmin(ModelAdmin):
     list_display = ['referral', 'note', 'flow', 'total', 'created_at']
 
 
+class ReferralTransactionArchiveModelAdmin(ModelAdmin):
+    model = TransactionArchive
+    permission_helper_class = ReadOnlyPermissionHelper
+    inspect_view_enabled = True
+    menu_icon = 'fa-archive',
+    menu_label = _('Archived Transactions')
+    list_filter = ['created_at', 'flow']
+    list_select_related = ['referral']
+    search_fields = ['inner_id', 'referral__account__username']
+    list_display = ['referral', 'note', 'flow', 'total', 'created_at']
+
+
 class DonationModelAdmin(ModelAdmin):
     model = Donation
     inspect_view_enabled = True
@@ -172,9 +185,10 @@ class DonationModelAdmin(ModelAdmin):
     edit_handler = ObjectList([
         MultiFieldPanel([
             FieldPanel('fullname'),
-            FieldPanel('agreement'),
-            FieldPanel('referral'),
-            FieldPanel('fundraiser'),
+            FieldPanel('agreement', widget=AutocompleteSelect('agreement')),
+            FieldPanel('referral', widget=AutocompleteSelect('referral')),
+            FieldPanel('fundraiser', widget=AutocompleteSelect('fundraiser')),
+            FieldPanel('campaign', widget=AutocompleteSelect('campaign')),
             # FieldPanel('campaigner'),
             FieldPanel('donation'),
         ])
@@ -226,7 +240,7 @@ class ReferralWithdrawModelAdmin(ModelAdmin):
     edit_handler = ObjectList([
         MultiFieldPanel([
             FieldPanel('fullname'),
-            FieldPanel('referral'),
+            FieldPanel('referral', widget=AutocompleteSelect('referral')),
             FieldPanel('amount'),
             FieldPanel('creator'),
         ])
@@ -244,7 +258,7 @@ class FundraiserWithdrawModelAdmin(ModelAdmin):
     edit_handler = ObjectList([
         MultiFieldPanel([
             FieldPanel('fullname'),
-            FieldPanel('fundraiser'),
+            FieldPanel('fundraiser', widget=AutocompleteSelect('fundraiser')),
             FieldPanel('amount'),
             FieldPanel('creator'),
         ])
@@ -257,6 +271,7 @@ class ReferralModelAdminGroup(ModelAdminGroup):
     items = [
         ReferralModelAdmin,
         ReferralTransactionModelAdmin,
+        ReferralTransactionArchiveModelAdmin,
         ReferralWithdrawModelAdmin
     ]
 
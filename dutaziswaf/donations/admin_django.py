@@ -5,6 +5,7 @@ from django_extra_referrals.feeschema import get_fee_schema_class
 from django_fundraisers.fundingchema import get_funding_schema_class
 
 from .models import Donation, ReferralWithdraw, FundraiserWithdraw, Agreement
+from .signals import donation_confirmed, donation_cancelled, withdraw_confirmed, withdraw_cancelled
 
 
 class DonationAdmin(admin.ModelAdmin):
@@ -26,17 +27,19 @@ class DonationAdmin(admin.ModelAdmin):
                 donation.is_paid = True
                 donation.is_cancelled = False
                 donation.save()
+                donation_confirmed.send(sender=Donation, instance=donation)
 
     confirm_donation.short_description = 'Confirm donations'
 
     def cancel_donation(self, request, queryset):
         with transaction.atomic():
-            qs = queryset.filter(is_paid=True)
+            qs = list(queryset.filter(is_paid=True))
+            fee_schema = get_fee_schema_class()
+            fee_schema.cancel_transactions([
+                donation for donation in qs
+                if donation.referral_id or donation.campaigner_id
+            ], 'IN')
             for donation in qs:
-                if donation.referral or donation.campaigner:
-                    fee_schema = get_fee_schema_class()
-                    schema = fee_schema(donation)
-                    schema.cancel_transaction('IN')
                 if donation.fundraiser:
                     funding_schema = get_funding_schema_class()
                     schema = funding_schema(donation)
@@ -44,6 +47,7 @@ class DonationAdmin(admin.ModelAdmin):
                 donation.is_paid = False
                 donation.is_cancelled = True
                 donation.save()
+                donation_cancelled.send(sender=Donation, instance=donation)
 
     cancel_donation.short_description = 'Cancel donations'
 
@@ -63,6 +67,7 @@ class ReferralWithdrawAdmin(admin.ModelAdmin):
                 withdraw.is_paid = True
                 withdraw.is_cancelled = False
                 withdraw.save()
+                withdraw_confirmed.send(sender=type(withdraw), instance=withdraw)
 
     def cancel_withdraw(self, request, queryset):
         """ Cancel withdraw """
@@ -74,6 +79,7 @@ class ReferralWithdrawAdmin(admin.ModelAdmin):
                 withdraw.is_paid = False
                 withdraw.is_cancelled = True
                 withdraw.save()
+                withdraw_cancelled.send(sender=type(withdraw), instance=withdraw)
 
     cancel_withdraw.short_description = 'Cancel withdraw'
 
@@ -93,6 +99,7 @@ class FundraiserWithdrawAdmin(admin.ModelAdmin):
                 withdraw.is_paid = True
                 withdraw.is_cancelled = False
                 withdraw.save()
+                withdraw_confirmed.send(sender=type(withdraw), instance=withdraw)
 
     def cancel_withdraw(self, request, queryset):
         """ Cancel withdraw """
@@ -104,6 +111,7 @@ class FundraiserWithdrawAdmin(admin.ModelAdmin):
                 withdraw.is_paid = False
                 withdraw.is_cancelled = True
                 withdraw.save()
+                withdraw_cancelled.send(sender=type(withdraw), instance=withdraw)
 
     cancel_withdraw.short_description = 'Cancel withdraw'
 
@@ -3,5 +3,8 @@ from django.apps import AppConfig as AppConfigBase
 
 class AppConfig(AppConfigBase):
     name = 'dutaziswaf.donations'
-    label = 'dutaziswaf_donations'
+    label = 'donations'
     verbose_name = 'Donations'
+
+    def ready(self):
+        from . import signals  # NOQA
@@ -0,0 +1,104 @@
+from django.http import JsonResponse, HttpResponseBadRequest, Http404
+from django.views.decorators.http import require_GET
+
+from django_extra_referrals.models import Referral
+from django_fundraisers.models import Fundraiser, Campaign
+
+from .models import Agreement
+
+AUTOCOMPLETE_LIMIT = 20
+AUTOCOMPLETE_MAX_LIMIT = 50
+
+
+class Lookup:
+    """
+        Prefix search over indexed columns plus an exact match on the
+        unique document number, so a lookup never scans the table.
+    """
+    model = None
+    prefix_fields = []
+    exact_field = 'inner_id'
+    select_related = []
+
+    def get_queryset(self):
+        queryset = self.model._default_manager.all()
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        return queryset
+
+    def get_order_value(self, obj):
+        value = obj
+        for name in self.prefix_fields[0].split('__'):
+            value = getattr(value, name)
+        return value or ''
+
+    def filter(self, term, limit):
+        """
+            One query per field, an OR across joined tables can not use
+            their indexes. Each returns the first ``limit`` rows in order,
+            so the merged first ``limit`` rows are the same an OR would give.
+        """
+        conditions = [{self.exact_field: term}] + [
+            {'%s__istartswith' % field: term} for field in self.prefix_fields]
+        queryset = self.get_queryset().order_by(self.prefix_fields[0], 'pk')
+        found = {}
+        for condition in conditions:
+            for obj in queryset.filter(**condition)[:limit]:
+                found.setdefault(obj.pk, obj)
+        return sorted(found.values(), key=lambda obj: (self.get_order_value(obj), str(obj.pk)))[:limit]
+
+    def get_label(self, obj):
+        number = getattr(obj, self.exact_field, None)
+        return '%s #%s' % (obj, number) if number else str(obj)
+
+
+class FundraiserLookup(Lookup):
+    model = Fundraiser
+    prefix_fields = ['name']
+
+
+class CampaignLookup(Lookup):
+    model = Campaign
+    prefix_fields = ['title']
+
+
+class ReferralLookup(Lookup):
+    model = Referral
+    prefix_fields = ['account__username', 'account__first_name']
+    select_related = ['account']
+
+
+class AgreementLookup(Lookup):
+    model = Agreement
+    prefix_fields = ['name']
+    exact_field = 'slug'
+
+    def get_label(self, obj):
+        return str(obj)
+
+
+lookups = {
+    'fundraiser': FundraiserLookup(),
+    'campaign': CampaignLookup(),
+    'referral': ReferralLookup(),
+    'agreement': AgreementLookup(),
+}
+
+
+@require_GET
+def autocomplete(request, name):
+    """ JSON {'results': [{'id', 'text'}]} of rows matching the ``q`` prefix """
+    lookup = lookups.get(name)
+    if lookup is None:
+        raise Http404
+    try:
+        limit = min(int(request.GET.get('limit', AUTOCOMPLETE_LIMIT)), AUTOCOMPLETE_MAX_LIMIT)
+    except ValueError:
+        return HttpResponseBadRequest("Invalid limit")
+    term = request.GET.get('q', '').strip()
+    if not term:
+        return JsonResponse({'results': []})
+    return JsonResponse({'results': [
+        {'id': str(obj.pk), 'text': lookup.get_label(obj)}
+        for obj in lookup.filter(term, max(limit, 1))
+    ]})
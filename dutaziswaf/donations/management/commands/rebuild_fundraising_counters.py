@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from django_fundraisers.models import Fundraiser, Campaign
+from dutaziswaf.donations.models import Donation, FundraiserWithdraw
+from dutaziswaf.donations.rollups import rebuild_fundraising_counters
+
+
+class Command(BaseCommand):
+    help = "Rebuild fundraiser and campaign counters from paid donations and withdraws"
+
+    def handle(self, *args, **options):
+        fundraisers, campaigns = rebuild_fundraising_counters(
+            Fundraiser, Campaign, Donation, FundraiserWithdraw)
+        self.stdout.write(self.style.SUCCESS(
+            "%s fundraisers and %s campaigns rebuilt" % (fundraisers, campaigns)))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from django_extra_referrals.models import Referral
+from dutaziswaf.donations.models import Donation
+from dutaziswaf.donations.rollups import rebuild_referral_rollups
+
+
+class Command(BaseCommand):
+    help = "Rebuild referral network rollups from paid donations"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--trees', type=int, default=100,
+            help="Number of referral trees updated per transaction")
+
+    def handle(self, *args, **options):
+        updated = rebuild_referral_rollups(Referral, Donation, options['trees'])
+        self.stdout.write(self.style.SUCCESS("%s referrals rebuilt" % updated))
@@ -0,0 +1,20 @@
+# Generated by Django 3.0.14 on 2026-10-19 15:37
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_fundraisers', '0006_fundraising_counters'),
+        ('donations', '0011_auto_20200410_0101'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='donation',
+            name='campaign',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='donations', to='django_fundraisers.Campaign', verbose_name='Campaign'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 3.0.14 on 2026-10-19 15:46
+
+from django.db import migrations
+
+from django_fundraisers.utils.indexes import AddPrefixIndexes
+
+
+# Used by the istartswith lookups of the admin autocomplete endpoints
+PREFIX_INDEXES = [
+    ('donations_agreement', 'name', 'agreement_name_prefix_idx'),
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('donations', '0012_donation_campaign'),
+    ]
+
+    operations = [
+        AddPrefixIndexes(PREFIX_INDEXES),
+    ]
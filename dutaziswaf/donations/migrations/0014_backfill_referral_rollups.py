@@ -0,0 +1,24 @@
+# Generated by Django 3.0.14 on 2026-10-19 16:05
+
+from django.db import migrations
+
+from dutaziswaf.donations.rollups import rebuild_referral_rollups
+
+
+def backfill_referral_rollups(apps, schema_editor):
+    """ Rollups added by django_extra_referrals 0003 start at 0, count paid donations """
+    rebuild_referral_rollups(
+        apps.get_model('django_extra_referrals', 'Referral'),
+        apps.get_model('donations', 'Donation'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_extra_referrals', '0003_referral_network_rollups'),
+        ('donations', '0013_agreement_pattern_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_referral_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 3.0.14 on 2026-10-19 16:40
+
+from django.db import migrations
+
+from dutaziswaf.donations.rollups import rebuild_fundraising_counters
+
+
+def backfill_fundraising_counters(apps, schema_editor):
+    """ Counters added by django_fundraisers 0006 start at 0, count paid rows """
+    rebuild_fundraising_counters(
+        apps.get_model('django_fundraisers', 'Fundraiser'),
+        apps.get_model('django_fundraisers', 'Campaign'),
+        apps.get_model('donations', 'Donation'),
+        apps.get_model('donations', 'FundraiserWithdraw'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_fundraisers', '0006_fundraising_counters'),
+        ('donations', '0014_backfill_referral_rollups'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_fundraising_counters, migrations.RunPython.noop),
+    ]
@@ -7,7 +7,7 @@ from django_extra_referrals.models import AbstractReceivable
 from django.contrib.contenttypes.fields import GenericRelation
 from django.contrib.auth import get_user_model
 
-from django_fundraisers.models import Fundraiser, FundraiserTransaction
+from django_fundraisers.models import Fundraiser, FundraiserTransaction, Campaign
 from django_extra_referrals.models import Referral, Transaction
 from django_numerators.models import NumeratorMixin
 from django_cashflow.models import Cash
@@ -64,6 +64,11 @@ class Donation(AbstractReceivable):
         related_name='donations',
         verbose_name=_("Mustahiq"),
         help_text=_('Mustahiq/Fundraiser account'))
+    campaign = models.ForeignKey(
+        Campaign, null=True, blank=True,
+        on_delete=models.SET_NULL,
+        related_name='donations',
+        verbose_name=_("Campaign"))
     donation = models.DecimalField(
         default=10000,
         max_digits=15,
@@ -0,0 +1,72 @@
+"""
+    Rebuild queries for denormalized donation rollups. Models are passed
+    in so data migrations can run them against historical models.
+"""
+from django.db import models, transaction
+from django.db.models.functions import Coalesce
+
+
+def _sum(queryset, field='amount'):
+    return Coalesce(
+        models.Subquery(
+            queryset.annotate(total=models.Sum(field)).values('total')[:1],
+            output_field=models.DecimalField(max_digits=15, decimal_places=2)),
+        models.Value(0))
+
+
+def _count(queryset):
+    return Coalesce(
+        models.Subquery(
+            queryset.annotate(total=models.Count('pk')).values('total')[:1],
+            output_field=models.IntegerField()),
+        models.Value(0))
+
+
+def _donation_counters(donation_model, **filters):
+    donations = donation_model._base_manager.filter(is_paid=True, **filters)
+    grouped = donations.order_by().values('is_paid')
+    return {
+        'total_raised': _sum(grouped),
+        'donation_count': _count(grouped),
+        'last_donation_at': models.Subquery(
+            donations.order_by('-created_at').values('created_at')[:1]),
+    }
+
+
+def rebuild_referral_rollups(referral_model, donation_model, trees=100):
+    """ Recompute network_total/network_count of every referral, returns rows updated """
+    donations = donation_model._base_manager.filter(
+        is_paid=True,
+        referral__tree_id=models.OuterRef('tree_id'),
+        referral__lft__gte=models.OuterRef('lft'),
+        referral__rght__lte=models.OuterRef('rght'),
+    ).order_by().values('is_paid')
+    network_total = _sum(donations)
+    network_count = _count(donations)
+
+    referrals = referral_model._base_manager
+    tree_ids = list(referrals.filter(parent__isnull=True).order_by(
+        'tree_id').values_list('tree_id', flat=True))
+    step = max(trees, 1)
+    updated = 0
+    for idx in range(0, len(tree_ids), step):
+        batch = tree_ids[idx:idx + step]
+        with transaction.atomic():
+            updated += referrals.filter(
+                tree_id__gte=batch[0], tree_id__lte=batch[-1]
+            ).update(network_total=network_total, network_count=network_count)
+    return updated
+
+
+def rebuild_fundraising_counters(fundraiser_model, campaign_model, donation_model, withdraw_model):
+    """ Recompute fundraiser and campaign counters, returns (fundraisers, campaigns) updated """
+    withdraws = withdraw_model._base_manager.filter(
+        is_paid=True, fundraiser_id=models.OuterRef('pk')
+    ).order_by().values('is_paid')
+    with transaction.atomic():
+        fundraisers = fundraiser_model._base_manager.update(
+            total_withdrawn=_sum(withdraws),
+            **_donation_counters(donation_model, fundraiser_id=models.OuterRef('pk')))
+        campaigns = campaign_model._base_manager.update(
+            **_donation_counters(donation_model, campaign_id=models.OuterRef('pk')))
+    return fundraisers, campaigns
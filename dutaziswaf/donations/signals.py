@@ -0,0 +1,149 @@
+from django.db import models
+from django.db.models.functions import Coalesce, Greatest
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver, Signal
+from django.utils import timezone
+
+from mptt.signals import node_moved
+
+from django_extra_referrals.models import Referral, ReferralLinkStat
+from django_fundraisers.listing import invalidate_listings
+from django_fundraisers.models import Fundraiser, Campaign
+
+from .models import Donation, ReferralWithdraw, FundraiserWithdraw
+from .summaries import invalidate_referral_summary
+
+# Sent inside the confirm/cancel transaction, after the donation is saved
+donation_confirmed = Signal(providing_args=['instance'])
+donation_cancelled = Signal(providing_args=['instance'])
+withdraw_confirmed = Signal(providing_args=['instance'])
+withdraw_cancelled = Signal(providing_args=['instance'])
+
+
+def get_upline_id(referral_id):
+    if not referral_id:
+        return None
+    return Referral.objects.filter(pk=referral_id).values_list('parent_id', flat=True).first()
+
+
+@receiver(post_save, sender=Donation)
+@receiver(post_delete, sender=Donation)
+def invalidate_donation_referral_summary(sender, instance, **kwargs):
+    """ Donation counts for its referral and as downline fundraising of the upline """
+    invalidate_referral_summary(instance.referral_id, get_upline_id(instance.referral_id))
+
+
+@receiver(post_save, sender=ReferralWithdraw)
+@receiver(post_delete, sender=ReferralWithdraw)
+def invalidate_withdraw_referral_summary(sender, instance, **kwargs):
+    invalidate_referral_summary(instance.referral_id)
+
+
+@receiver(post_save, sender=Referral)
+@receiver(post_delete, sender=Referral)
+def invalidate_referral_summaries(sender, instance, **kwargs):
+    invalidate_referral_summary(instance.pk, instance.parent_id)
+
+
+@receiver(node_moved, sender=Referral)
+def invalidate_moved_referral_summaries(sender, instance, **kwargs):
+    """
+        Old upline loses a downline. MPTT already rewrote the cached
+        parent, Referral.save and move_to keep the old one aside.
+    """
+    old_parent_id = getattr(instance, 'previous_parent_id', None)
+    invalidate_referral_summary(old_parent_id)
+
+
+@receiver(post_save, sender=Fundraiser)
+@receiver(post_delete, sender=Fundraiser)
+def invalidate_founder_referral_summary(sender, instance, **kwargs):
+    if instance.founder_id:
+        invalidate_referral_summary(*Referral.objects.filter(
+            account_id=instance.founder_id
+        ).values_list('pk', flat=True))
+
+
+@receiver(donation_confirmed, sender=Donation)
+def add_referral_network_total(sender, instance, **kwargs):
+    if instance.referral_id:
+        Referral.objects.update_network_total(instance.referral, instance.amount, 1)
+
+
+@receiver(donation_cancelled, sender=Donation)
+def remove_referral_network_total(sender, instance, **kwargs):
+    if instance.referral_id:
+        Referral.objects.update_network_total(instance.referral, -instance.amount, -1)
+
+
+@receiver(donation_confirmed, sender=Donation)
+def add_referral_link_conversion(sender, instance, **kwargs):
+    """ Conversion counts on the donation day, a later cancel finds the same row """
+    if instance.referral_id:
+        ReferralLinkStat.objects.add_count(
+            instance.referral_id, timezone.localdate(instance.created_at), 1, 'conversions')
+
+
+@receiver(donation_cancelled, sender=Donation)
+def remove_referral_link_conversion(sender, instance, **kwargs):
+    if instance.referral_id:
+        ReferralLinkStat.objects.filter(
+            referral_id=instance.referral_id,
+            date=timezone.localdate(instance.created_at),
+            conversions__gt=0,
+        ).update(conversions=models.F('conversions') - 1)
+
+
+def get_last_donation_at(**filters):
+    """ Latest paid donation time of the outer row, recomputed after a cancel """
+    return models.Subquery(
+        Donation.objects.filter(is_paid=True, **filters).order_by(
+            '-created_at').values('created_at')[:1])
+
+
+def get_counter_targets(instance):
+    """ Fundraiser and campaign querysets whose counters follow this donation """
+    targets = []
+    if instance.fundraiser_id:
+        targets.append((
+            Fundraiser._base_manager.filter(pk=instance.fundraiser_id),
+            {'fundraiser_id': models.OuterRef('pk')}))
+    if instance.campaign_id:
+        targets.append((
+            Campaign.objects.filter(pk=instance.campaign_id),
+            {'campaign_id': models.OuterRef('pk')}))
+    return targets
+
+
+@receiver(donation_confirmed, sender=Donation)
+def add_fundraising_counters(sender, instance, **kwargs):
+    """ Counters move in the confirm transaction, cards and progress bars need no aggregates """
+    created_at = models.Value(instance.created_at)
+    for queryset, _ in get_counter_targets(instance):
+        queryset.update(
+            total_raised=models.F('total_raised') + instance.amount,
+            donation_count=models.F('donation_count') + 1,
+            last_donation_at=Greatest(Coalesce('last_donation_at', created_at), created_at))
+        invalidate_listings(queryset.model)
+
+
+@receiver(donation_cancelled, sender=Donation)
+def remove_fundraising_counters(sender, instance, **kwargs):
+    for queryset, filters in get_counter_targets(instance):
+        queryset.update(
+            total_raised=models.F('total_raised') - instance.amount,
+            donation_count=models.F('donation_count') - 1,
+            last_donation_at=get_last_donation_at(**filters))
+        invalidate_listings(queryset.model)
+
+
+@receiver(withdraw_confirmed, sender=FundraiserWithdraw)
+def add_fundraiser_withdrawn(sender, instance, **kwargs):
+    Fundraiser._base_manager.filter(pk=instance.fundraiser_id).update(
+        total_withdrawn=models.F('total_withdrawn') + instance.amount)
+
+
+@receiver(withdraw_cancelled, sender=FundraiserWithdraw)
+def remove_fundraiser_withdrawn(sender, instance, **kwargs):
+    Fundraiser._base_manager.filter(pk=instance.fundraiser_id).update(
+        total_withdrawn=models.F('total_withdrawn') - instance.amount)
@@ -0,0 +1,78 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import models, transaction
+from django.db.models.functions import Coalesce
+
+from django_extra_referrals.models import Referral
+from django_fundraisers.models import Fundraiser
+
+from .models import Donation, ReferralWithdraw
+
+REFERRAL_SUMMARY_CACHE_KEY = 'referral_summary:%s'
+REFERRAL_SUMMARY_CACHE_TIMEOUT = getattr(settings, 'REFERRAL_SUMMARY_CACHE_TIMEOUT', 60 * 60)
+
+
+def _subquery_total(queryset, group_by, field, output_field):
+    """ Aggregate ``field`` of ``queryset`` as a correlated scalar subquery """
+    subquery = queryset.order_by().values(group_by).annotate(
+        total=field
+    ).values('total')[:1]
+    return Coalesce(
+        models.Subquery(subquery, output_field=output_field),
+        models.Value(0), output_field=output_field
+    )
+
+
+def _subquery_sum(queryset, group_by):
+    return _subquery_total(
+        queryset, group_by, models.Sum('amount'),
+        models.DecimalField(max_digits=15, decimal_places=2))
+
+
+def _subquery_count(queryset, group_by):
+    return _subquery_total(
+        queryset, group_by, models.Count('pk'), models.IntegerField())
+
+
+def get_referral_summary_key(referral_id):
+    return REFERRAL_SUMMARY_CACHE_KEY % referral_id
+
+
+def compute_referral_summary(referral_id):
+    """ Compute referral dashboard figures with one aggregate query """
+    outer = models.OuterRef('pk')
+    return Referral.objects.filter(pk=referral_id).annotate(
+        donation_value=_subquery_sum(
+            Donation.objects.filter(referral=outer, is_paid=True), 'referral'),
+        fundraised_value=_subquery_sum(
+            Donation.objects.filter(referral__parent=outer, is_paid=True), 'referral__parent'),
+        withdraw_value=_subquery_sum(
+            ReferralWithdraw.objects.filter(referral=outer, is_paid=True), 'referral'),
+        downlines_count=_subquery_count(
+            Referral.objects.filter(parent=outer), 'parent'),
+        fundraisers_count=_subquery_count(
+            Fundraiser.objects.filter(founder=models.OuterRef('account')), 'founder'),
+    ).values(
+        'donation_value',
+        'fundraised_value',
+        'withdraw_value',
+        'downlines_count',
+        'fundraisers_count',
+    ).get()
+
+
+def get_referral_summary(referral):
+    """ Return cached referral summary, computing it on cache miss """
+    key = get_referral_summary_key(referral.pk)
+    summary = cache.get(key)
+    if summary is None:
+        summary = compute_referral_summary(referral.pk)
+        cache.set(key, summary, REFERRAL_SUMMARY_CACHE_TIMEOUT)
+    return summary
+
+
+def invalidate_referral_summary(*referral_ids):
+    """ Drop cached summaries once committed, a reader can not cache rolled back figures """
+    keys = [get_referral_summary_key(pk) for pk in referral_ids if pk]
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
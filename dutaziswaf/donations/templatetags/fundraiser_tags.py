@@ -1,4 +1,3 @@
-from django.db import models
 from django.template import Library
 from dutaziswaf.accounts.models import get_gravatar_url
 
@@ -9,22 +8,12 @@ register = Library()
 def fundraiser_summary(context):
     fundraiser = context.get('instance')
 
-    total_fundraised = fundraiser.donations.all().filter(
-        is_paid=True
-    ).aggregate(
-        total_donation=models.Sum('amount')
-    )['total_donation']
-
-    total_withdraw = fundraiser.withdraws.all().filter(
-        is_paid=True
-    ).aggregate(
-        total_withdraw=models.Sum('amount')
-    )['total_withdraw']
-
     return {
-        'fundraised_value': total_fundraised or 0,
-        'withdraw_value': total_withdraw or 0,
+        'fundraised_value': fundraiser.total_raised or 0,
+        'withdraw_value': fundraiser.total_withdrawn or 0,
         'balance_value': fundraiser.balance or 0,
+        'donation_count': fundraiser.donation_count,
+        'last_donation_at': fundraiser.last_donation_at,
     }
 
 @register.simple_tag(takes_context=True)
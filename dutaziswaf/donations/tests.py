@@ -0,0 +1,85 @@
+import threading
+import unittest
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db.models import Sum
+from django.test import TestCase, TransactionTestCase
+
+from django_extra_referrals.feeschema import FlatFeeSchema
+from django_extra_referrals.models import Referral
+from django_fundraisers.fundingchema import FlatFundingSchema
+from django_fundraisers.models import Fundraiser, FundraiserTransaction
+
+from .models import Donation
+
+
+@unittest.skipUnless(connection.vendor == 'postgresql', "Needs row locks of PostgreSQL")
+class ConcurrentFundraiserPostingTest(TransactionTestCase):
+    """ Postings from parallel confirmations must chain on the locked fundraiser row """
+    threads = 8
+    postings = 5
+
+    def setUp(self):
+        founder = get_user_model().objects.create(username='founder')
+        self.fundraiser = Fundraiser.objects.create(name='Fundraiser', founder=founder)
+
+    def post_donations(self, donations, barrier, errors):
+        try:
+            barrier.wait()
+            for donation in donations:
+                FlatFundingSchema(donation).receive_fundraiser_balance()
+        except Exception as err:
+            errors.append(err)
+        finally:
+            connection.close()
+
+    def test_balance_equals_sum_of_postings(self):
+        for idx in range(self.threads * self.postings):
+            Donation.objects.create(fullname='Donor', fundraiser=self.fundraiser, donation=10000 + idx)
+        # Loaded back like the confirm action does, amount is a Decimal
+        donations = list(Donation.objects.filter(fundraiser=self.fundraiser))
+        barrier = threading.Barrier(self.threads)
+        errors = []
+        workers = [
+            threading.Thread(target=self.post_donations, args=(
+                donations[idx::self.threads], barrier, errors))
+            for idx in range(self.threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        self.assertEqual(errors, [])
+
+        transactions = FundraiserTransaction.objects.filter(fundraiser=self.fundraiser)
+        posted = transactions.aggregate(total=Sum('total'))['total']
+        self.fundraiser.refresh_from_db()
+        self.assertEqual(transactions.count(), len(donations))
+        self.assertEqual(self.fundraiser.balance, posted)
+
+        # Every posting continues from the balance left by the previous one
+        balance = Decimal('0')
+        for trx in transactions.order_by('balance'):
+            self.assertEqual(trx.old_balance, balance)
+            self.assertEqual(trx.balance, trx.old_balance + trx.total)
+            balance = trx.balance
+
+
+class ConfirmCancelCycleTest(TestCase):
+    """ Each cancel reverses what is still outstanding, not every posting again """
+
+    def test_second_cancel_reverses_second_confirm_only(self):
+        User = get_user_model()
+        upline = Referral.objects.create(account=User.objects.create(username='upline'))
+        referral = Referral.objects.create(account=User.objects.create(username='referral'), parent=upline)
+        pk = Donation.objects.create(fullname='Donor', referral=referral, donation=10000).pk
+        for cycle in range(2):
+            FlatFeeSchema(Donation.objects.get(pk=pk)).receive_referral_balance()
+            upline.refresh_from_db()
+            self.assertGreater(upline.balance, 0)
+            reversals = FlatFeeSchema.cancel_transactions([Donation.objects.get(pk=pk)], 'IN')
+            self.assertEqual(len(reversals), 1)
+            upline.refresh_from_db()
+            self.assertEqual(upline.balance, 0)
+        self.assertEqual(FlatFeeSchema.cancel_transactions([Donation.objects.get(pk=pk)], 'IN'), [])
@@ -0,0 +1,17 @@
+from django.urls import include, path
+
+from wagtail.core import hooks
+
+from django_extra_referrals import urls as referral_urls
+from django_fundraisers import admin_urls as fundraiser_urls
+
+from .autocomplete import autocomplete
+
+
+@hooks.register('register_admin_urls')
+def register_referral_urls():
+    return [
+        path('referrals/', include(referral_urls, namespace='django_extra_referrals')),
+        path('fundraisers/', include(fundraiser_urls, namespace='django_fundraisers_admin')),
+        path('autocomplete/<str:name>/', autocomplete, name='donations_autocomplete'),
+    ]
@@ -0,0 +1,32 @@
+from django import forms
+from django.urls import reverse
+
+
+class AutocompleteSelect(forms.Select):
+    """
+        Select rendering only the chosen option, the rest are fetched
+        from the autocomplete endpoint as the user types. Rendering a
+        form never iterates the field queryset.
+    """
+
+    def __init__(self, lookup, attrs=None):
+        super().__init__(attrs)
+        self.lookup = lookup
+
+    class Media:
+        js = ['js/autocomplete_select.js']
+
+    def build_attrs(self, base_attrs, extra_attrs=None):
+        attrs = super().build_attrs(base_attrs, extra_attrs)
+        attrs['data-autocomplete-url'] = reverse('donations_autocomplete', args=(self.lookup,))
+        return attrs
+
+    def optgroups(self, name, value, attrs=None):
+        selected = [v for v in value if v not in ('', None)]
+        options = [self.create_option(name, '', '---------', not selected, 0)]
+        if selected:
+            field = self.choices.field
+            for idx, obj in enumerate(field.queryset.filter(pk__in=selected), 1):
+                options.append(self.create_option(
+                    name, str(obj.pk), field.label_from_instance(obj), True, idx))
+        return [(None, options, 0)]
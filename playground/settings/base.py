@@ -83,6 +83,8 @@ MIDDLEWARE = [
 
     'wagtail.core.middleware.SiteMiddleware',
     'wagtail.contrib.redirects.middleware.RedirectMiddleware',
+
+    'django_extra_referrals.middleware.ReferralLinkMiddleware',
 ]
 
 ROOT_URLCONF = 'playground.urls'
@@ -119,6 +121,19 @@ DATABASES = {
 }
 
 
+# Cache
+# Referral config, summaries and listing versions must be visible to every
+# gunicorn worker, so the cache is shared through the database. The table
+# is created by `manage.py createcachetable` in release-task.sh.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'django_cache',
+    }
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/3.0/ref/settings/#auth-password-validators
 
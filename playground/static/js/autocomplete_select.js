@@ -0,0 +1,42 @@
+(function () {
+    'use strict';
+
+    function enhance(select) {
+        var input = document.createElement('input');
+        input.type = 'search';
+        input.placeholder = select.dataset.autocompletePlaceholder || 'Search…';
+        input.autocomplete = 'off';
+        select.parentNode.insertBefore(input, select);
+
+        var timer = null;
+        input.addEventListener('input', function () {
+            clearTimeout(timer);
+            timer = setTimeout(function () {
+                var term = input.value.trim();
+                if (!term) { return; }
+                var url = select.dataset.autocompleteUrl + '?q=' + encodeURIComponent(term);
+                fetch(url, {credentials: 'same-origin'})
+                    .then(function (response) { return response.json(); })
+                    .then(function (data) { replaceOptions(select, data.results); });
+            }, 250);
+        });
+    }
+
+    function replaceOptions(select, results) {
+        var current = select.value;
+        Array.prototype.slice.call(select.options).forEach(function (option) {
+            if (option.value && option.value !== current) { select.removeChild(option); }
+        });
+        results.forEach(function (result) {
+            if (result.id === current) { return; }
+            var option = document.createElement('option');
+            option.value = result.id;
+            option.textContent = result.text;
+            select.appendChild(option);
+        });
+    }
+
+    document.addEventListener('DOMContentLoaded', function () {
+        document.querySelectorAll('select[data-autocomplete-url]').forEach(enhance);
+    });
+})();
@@ -0,0 +1,66 @@
+(function () {
+    'use strict';
+
+    function loadChildren(list, url, after) {
+        var query = after ? '?after=' + encodeURIComponent(after) : '';
+        return fetch(url + query, {credentials: 'same-origin'})
+            .then(function (response) { return response.json(); })
+            .then(function (data) {
+                data.results.forEach(function (node) {
+                    list.appendChild(renderNode(list.dataset.template, node));
+                });
+                var more = list.querySelector(':scope > li.referral-tree__more');
+                if (more) { list.removeChild(more); }
+                if (data.next) {
+                    more = document.createElement('li');
+                    more.className = 'referral-tree__more';
+                    var button = document.createElement('button');
+                    button.type = 'button';
+                    button.className = 'button button-small button-secondary';
+                    button.textContent = list.dataset.moreLabel;
+                    button.addEventListener('click', function () {
+                        button.disabled = true;
+                        loadChildren(list, url, data.next);
+                    });
+                    more.appendChild(button);
+                    list.appendChild(more);
+                }
+            });
+    }
+
+    function renderNode(template, node) {
+        var item = document.createElement('li');
+        var toggle = document.createElement('button');
+        toggle.type = 'button';
+        toggle.className = 'button button-small button-secondary';
+        toggle.textContent = node.has_children ? '+' : '·';
+        toggle.disabled = !node.has_children;
+        var label = document.createElement('span');
+        label.textContent = ' ' + node.name + ' #' + node.inner_id + ' (' + node.descendants + ')';
+        item.appendChild(toggle);
+        item.appendChild(label);
+        if (node.has_children) {
+            var children = document.createElement('ul');
+            children.dataset.template = template;
+            children.dataset.moreLabel = document.querySelector('[data-referral-tree]').dataset.moreLabel;
+            children.hidden = true;
+            item.appendChild(children);
+            toggle.addEventListener('click', function () {
+                if (!children.dataset.loaded) {
+                    children.dataset.loaded = '1';
+                    loadChildren(children, template.replace('00000000-0000-0000-0000-000000000000', node.id));
+                }
+                children.hidden = !children.hidden;
+                toggle.textContent = children.hidden ? '+' : '-';
+            });
+        }
+        return item;
+    }
+
+    document.addEventListener('DOMContentLoaded', function () {
+        var root = document.querySelector('[data-referral-tree]');
+        if (!root) { return; }
+        root.dataset.template = root.dataset.urlTemplate;
+        loadChildren(root, root.dataset.urlTemplate.replace('00000000-0000-0000-0000-000000000000', root.dataset.referral));
+    });
+})();
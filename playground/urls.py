@@ -15,6 +15,7 @@ urlpatterns = [
     url(r'^documents/', include(wagtaildocs_urls)),
 
     url(r'^search/$', search_views.search, name='search'),
+    url(r'^fundraising/', include('django_fundraisers.urls')),
 
 ]
 
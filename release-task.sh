@@ -1,3 +1,4 @@
 #!/usr/bin/env bash
 python manage.py migrate
+python manage.py createcachetable
 python manage.py collectstatic --noinput
\ No newline at end of file